@@ -2,22 +2,33 @@ import os
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from sqlite_mirror import SqliteMirror
+from table_reader import iter_table
+
 load_dotenv()
 
 SUPABASE_URL = os.getenv("VITE_SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
-def check_db():
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        print("Missing credentials")
-        return
+def check_db(backend='supabase'):
+    if backend == 'sqlite':
+        rows = SqliteMirror().news(team_name='Inter')
+    else:
+        if not SUPABASE_URL or not SUPABASE_KEY:
+            print("Missing credentials")
+            return
 
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-    res = supabase.table('news').select('*').eq('team_name', 'Inter').execute()
+        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        rows = list(iter_table(supabase, 'news', '*', filters={'team_name': 'Inter'}))
     
-    print(f"Total entries for Inter: {len(res.data)}")
-    for row in res.data[:10]:
+    print(f"Total entries for Inter: {len(rows)}")
+    for row in rows[:10]:
         print(f"[{row['source']}] {row['title']} (Sent: {row['sentiment']})")
 
 if __name__ == "__main__":
-    check_db()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check news entries")
+    parser.add_argument("--backend", choices=["supabase", "sqlite"], default="supabase")
+    args = parser.parse_args()
+    check_db(args.backend)
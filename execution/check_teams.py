@@ -5,10 +5,16 @@ Elenca tutte le squadre presenti e identifica eventuali duplicati o inconsistenz
 
 import os
 import sys
-from collections import defaultdict
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from dimensions import FixtureArray, load_fixtures, try_load_dimensions
+from local_backends import BACKEND_CHOICES, open_local_backend
+from season_roster import load_expected
+from table_reader import DEFAULT_WORKERS, iter_table
+from team_duplicates import DEFAULT_MIN_SCORE, find_duplicate_clusters
+from team_resolver import get_resolver
+
 # Setup
 load_dotenv()
 
@@ -21,43 +27,35 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-def check_teams():
+def load_matches(backend='supabase'):
+    columns = ['home_team', 'away_team', 'league', 'season']
+    if backend != 'supabase':
+        return open_local_backend(backend).rows(columns=columns)
+
+    return iter_table(supabase, 'matches', ', '.join(columns), workers=DEFAULT_WORKERS)
+
+def load_fixtures_compact(backend='supabase'):
+    """FixtureArray of all matches; on Supabase only the integer id columns are transferred"""
+    if backend == 'supabase':
+        dims = try_load_dimensions(supabase)
+        if dims:
+            return load_fixtures(supabase, dims)
+    return FixtureArray.from_rows(load_matches(backend))
+
+def check_teams(backend='supabase', min_score=DEFAULT_MIN_SCORE):
     print("\n" + "="*60)
     print("🔍 MAGOTTO - VERIFICA SQUADRE DATABASE")
     print("="*60)
     
-    # Fetch all matches
-    print("\n📥 Caricamento partite dal database...")
-    all_data = []
-    offset = 0
-    batch_size = 1000
+    # Fetch all matches (compact int-array encoding: ids instead of repeated names)
+    print(f"\n📥 Caricamento partite ({backend})...")
+    fixtures = load_fixtures_compact(backend)
     
-    while True:
-        result = supabase.table('matches').select('home_team, away_team, league, season').range(offset, offset + batch_size - 1).execute()
-        if not result.data:
-            break
-        all_data.extend(result.data)
-        offset += batch_size
-        if len(result.data) < batch_size:
-            break
-    
-    print(f"✅ Caricate {len(all_data)} partite")
+    print(f"✅ Caricate {len(fixtures)} partite ({fixtures.nbytes // 1024} KB)")
     
     # Extract unique teams
-    teams_by_league = defaultdict(set)
-    all_teams = set()
-    
-    for match in all_data:
-        home = match.get('home_team', '')
-        away = match.get('away_team', '')
-        league = match.get('league', 'Unknown')
-        
-        if home:
-            all_teams.add(home)
-            teams_by_league[league].add(home)
-        if away:
-            all_teams.add(away)
-            teams_by_league[league].add(away)
+    teams_by_league = fixtures.teams_by_league()
+    all_teams = set().union(*teams_by_league.values())
     
     # Print summary
     print(f"\n📊 RIEPILOGO:")
@@ -115,56 +113,8 @@ def check_teams():
     print("⚠️  POTENZIALI DUPLICATI O INCONSISTENZE")
     print("="*60)
     
-    # Known variations that should be normalized
-    known_variations = {
-        # Italian teams
-        "Inter": ["Internazionale", "Internazionale Milano", "Inter Milan", "FC Internazionale"],
-        "Milan": ["AC Milan", "AC Milan Milano"],
-        "Juventus": ["Juventus FC", "Juve"],
-        "Roma": ["AS Roma"],
-        "Napoli": ["SSC Napoli"],
-        "Atalanta": ["Atalanta BC"],
-        "Verona": ["Hellas Verona"],
-        "Lazio": ["SS Lazio"],
-        
-        # Spanish teams
-        "Athletic Club": ["Athletic Bilbao"],
-        "Atletico Madrid": ["Atlético Madrid", "Atletico"],
-        "Real Betis": ["Betis"],
-        
-        # English teams
-        "Man City": ["Manchester City", "Manchester C"],
-        "Man United": ["Manchester United", "Manchester U"],
-        "Tottenham": ["Spurs"],
-        "West Ham": ["West Ham United"],
-        "Newcastle": ["Newcastle United"],
-        "Brighton": ["Brighton & Hove Albion", "Brighton Hove Albion"],
-        "Nott'm Forest": ["Nottingham Forest", "Nottingham"],
-        "Wolves": ["Wolverhampton", "Wolverhampton Wanderers"],
-        "Leicester": ["Leicester City"],
-        "Leeds": ["Leeds United"],
-        "Sheffield Utd": ["Sheffield United"],
-        
-        # French teams
-        "Paris SG": ["Paris Saint-Germain", "PSG"],
-        "Marseille": ["Olympique de Marseille", "Olympique Marseille", "OM"],
-        "Lyon": ["Olympique Lyon", "Olympique Lyonnais"],
-        "St Etienne": ["Saint-Etienne"],
-        
-        # German teams
-        "Bayern Munich": ["FC Bayern", "Bayern München"],
-        "Dortmund": ["Borussia Dortmund", "BVB"],
-        "M'gladbach": ["Borussia M'gladbach", "Monchengladbach", "Borussia Mönchengladbach"],
-        "Leverkusen": ["Bayer Leverkusen", "Bayer 04"],
-        "RB Leipzig": ["Leipzig"],
-        "Hoffenheim": ["TSG Hoffenheim"],
-        "Wolfsburg": ["VfL Wolfsburg"],
-        "Frankfurt": ["Eintracht Frankfurt"],
-        "Freiburg": ["SC Freiburg"],
-        "Stuttgart": ["VfB Stuttgart"],
-        "Mainz": ["Mainz 05"],
-        "Union Berlin": ["1. FC Union Berlin"],
-    }
+    # Known variations that should be normalized (shared resolver, config/team_aliases.json)
+    known_variations = get_resolver().variations()
     
     issues_found = []
     
@@ -178,21 +128,18 @@ def check_teams():
             if len(found_variations) > 1:
                 issues_found.append(f"🔄 Variazioni multiple per {canonical}: {', '.join(found_variations)}")
     
-    # Check for similar names using simple matching
-    teams_list = sorted(all_teams)
-    for i, team1 in enumerate(teams_list):
-        for team2 in teams_list[i+1:]:
-            # Check if one is a prefix of the other
-            if team1.lower() in team2.lower() or team2.lower() in team1.lower():
-                if len(team1) > 3 and len(team2) > 3:  # Avoid false positives with short names
-                    if team1.lower() != team2.lower():
-                        issues_found.append(f"❓ Possibile duplicato: '{team1}' vs '{team2}'")
+    # Fuzzy near-duplicates: trigram blocking + union-find, no pairwise scan
+    clusters = find_duplicate_clusters(fixtures.team_counts(), min_score)
+    for cluster in clusters:
+        aliases = ', '.join(f"{a} ({cluster.counts[a]})" for a in cluster.aliases)
+        issues_found.append(
+            f"❓ [{cluster.score:.2f}] {cluster.suggested} ({cluster.counts.get(cluster.suggested, 0)}) <- {aliases}"
+        )
     
     if issues_found:
-        for issue in issues_found[:30]:  # Limit output
+        for issue in issues_found:
             print(issue)
-        if len(issues_found) > 30:
-            print(f"   ... e altri {len(issues_found) - 30} potenziali problemi")
+        print(f"\n   {len(issues_found)} potenziali problemi ({len(clusters)} cluster di nomi simili)")
     else:
         print("✅ Nessun duplicato evidente trovato!")
     
@@ -201,12 +148,9 @@ def check_teams():
     print("🇮🇹 VERIFICA SERIE A 2025-2026")
     print("="*60)
     
-    expected_serie_a = [
-        "Inter", "Milan", "Juventus", "Napoli", "Roma", "Lazio",
-        "Atalanta", "Bologna", "Fiorentina", "Torino", "Verona",
-        "Udinese", "Empoli", "Genoa", "Cagliari", "Parma",
-        "Lecce", "Como", "Venezia", "Monza"
-    ]
+    # Expected teams: config/teams_2025_2026.yaml (same source as check_current_season.py)
+    expected = load_expected()
+    expected_serie_a = expected['SA']['teams']
     
     sa_teams = teams_by_league.get('SA', set())
     
@@ -229,12 +173,7 @@ def check_teams():
     print("🏴󠁧󠁢󠁥󠁮󠁧󠁿 VERIFICA PREMIER LEAGUE 2025-2026")
     print("="*60)
     
-    expected_pl = [
-        "Arsenal", "Aston Villa", "Bournemouth", "Brentford", "Brighton",
-        "Chelsea", "Crystal Palace", "Everton", "Fulham", "Ipswich",
-        "Leicester", "Liverpool", "Man City", "Man United", "Newcastle",
-        "Nott'm Forest", "Southampton", "Tottenham", "West Ham", "Wolves"
-    ]
+    expected_pl = expected['PL']['teams']
     
     pl_teams = teams_by_league.get('PL', set())
     
@@ -259,4 +198,12 @@ def check_teams():
     }
 
 if __name__ == "__main__":
-    check_teams()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Verifica squadre nel database")
+    parser.add_argument("--backend", choices=BACKEND_CHOICES, default="supabase",
+                        help="Sorgente dati: Supabase o mirror locale (Parquet / SQLite)")
+    parser.add_argument("--min-score", type=float, default=DEFAULT_MIN_SCORE,
+                        help="Similarità minima (0-1) per segnalare due nomi come duplicati")
+    args = parser.parse_args()
+    check_teams(args.backend, args.min_score)
@@ -2,6 +2,8 @@ import os
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from sqlite_mirror import SqliteMirror
+
 load_dotenv()
 
 SUPABASE_URL = os.getenv("VITE_SUPABASE_URL")
@@ -13,6 +15,17 @@ NON_SOCCER_KEYWORDS = [
     "olympics", "golf", "bbl", "perth scorchers", "sixers", "anthony joshua"
 ]
 
+def cleanup_sqlite():
+    mirror = SqliteMirror()
+    print(f"Cleaning local mirror {mirror.path}...")
+    total = 0
+    for kw in NON_SOCCER_KEYWORDS:
+        total += mirror.execute(
+            "DELETE FROM news WHERE lower(title) LIKE ? OR lower(summary) LIKE ?",
+            (f"%{kw}%", f"%{kw}%"),
+        )
+    print(f"Cleanup complete! Removed {total} rows.")
+
 def cleanup():
     if not SUPABASE_URL or not SUPABASE_KEY:
         print("Missing credentials")
@@ -32,4 +45,12 @@ def cleanup():
     print("Cleanup complete!")
 
 if __name__ == "__main__":
-    cleanup()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Remove non-soccer news")
+    parser.add_argument("--backend", choices=["supabase", "sqlite"], default="supabase")
+    args = parser.parse_args()
+    if args.backend == "sqlite":
+        cleanup_sqlite()
+    else:
+        cleanup()
@@ -2,11 +2,18 @@ import os
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from sqlite_mirror import SqliteMirror
+
 load_dotenv()
 
 SUPABASE_URL = os.getenv("VITE_SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
+def aggressive_cleanup_sqlite():
+    mirror = SqliteMirror()
+    removed = mirror.execute("DELETE FROM news WHERE team_name = ?", ("Inter",))
+    print(f"Purged {removed} Inter news from local mirror. Ready for fresh scrape.")
+
 def aggressive_cleanup():
     if not SUPABASE_URL or not SUPABASE_KEY:
         print("Missing credentials")
@@ -20,4 +27,12 @@ def aggressive_cleanup():
     print(f"Purged Inter news. Ready for fresh scrape.")
 
 if __name__ == "__main__":
-    aggressive_cleanup()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Purge all Inter news")
+    parser.add_argument("--backend", choices=["supabase", "sqlite"], default="supabase")
+    args = parser.parse_args()
+    if args.backend == "sqlite":
+        aggressive_cleanup_sqlite()
+    else:
+        aggressive_cleanup()
@@ -0,0 +1,101 @@
+"""
+RAW CSV CACHE - Cache su disco dei CSV di football-data.co.uk
+Stores every mmz4281/{season}/{file} body together with its ETag,
+Last-Modified header and SHA-256, so re-runs can issue conditional GETs
+and skip league-seasons whose content was already ingested.
+
+Layout:
+    data/raw_csv/{season}/{file}            raw body
+    data/raw_csv/{season}/{file}.meta.json  etag, last_modified, sha256, ingested_sha256
+"""
+
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent.parent / "data" / "raw_csv"
+
+
+class RawCsvCache:
+    """File-per-entry cache; each league-season owns its own files, so threads never share one"""
+
+    def __init__(self, root: Path = CACHE_DIR):
+        self.root = Path(root)
+
+    def _paths(self, season_code: str, file_name: str) -> tuple[Path, Path]:
+        base = self.root / season_code
+        return base / file_name, base / f"{file_name}.meta.json"
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+
+    def load_meta(self, season_code: str, file_name: str) -> dict:
+        _, meta_path = self._paths(season_code, file_name)
+        try:
+            return json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def has_body(self, season_code: str, file_name: str) -> bool:
+        body_path, _ = self._paths(season_code, file_name)
+        return body_path.is_file()
+
+    def iter_lines(self, season_code: str, file_name: str):
+        """Lazily yield the cached body as text lines (memory stays flat on large files)"""
+        body_path, _ = self._paths(season_code, file_name)
+        with open(body_path, encoding="utf-8", newline="") as f:
+            yield from f
+
+    @staticmethod
+    def conditional_headers(meta: dict) -> dict:
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    @staticmethod
+    def is_ingested(meta: dict) -> bool:
+        """True when the cached body has already been upserted successfully"""
+        return bool(meta.get("sha256")) and meta.get("ingested_sha256") == meta["sha256"]
+
+    def store(self, season_code: str, file_name: str, chunks, response_headers) -> dict:
+        """
+        Stream a fresh 200 body to disk, hashing it on the way. Keeps the
+        previous ingested hash so an unchanged file is detected.
+        """
+        body_path, meta_path = self._paths(season_code, file_name)
+        previous = self.load_meta(season_code, file_name)
+
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = body_path.with_name(body_path.name + ".tmp")
+        digest = hashlib.sha256()
+        with open(tmp, "wb") as f:
+            for chunk in chunks:
+                digest.update(chunk)
+                f.write(chunk)
+        tmp.replace(body_path)
+
+        meta = {
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+            "sha256": digest.hexdigest(),
+            "ingested_sha256": previous.get("ingested_sha256"),
+            "fetched_at": datetime.now().isoformat(),
+        }
+        self._write_atomic(meta_path, json.dumps(meta, indent=2).encode("utf-8"))
+        return meta
+
+    def mark_ingested(self, season_code: str, file_name: str, sha256: str):
+        """Record that the body with this hash reached the database"""
+        _, meta_path = self._paths(season_code, file_name)
+        meta = self.load_meta(season_code, file_name)
+        meta["ingested_sha256"] = sha256
+        meta["ingested_at"] = datetime.now().isoformat()
+        self._write_atomic(meta_path, json.dumps(meta, indent=2).encode("utf-8"))
@@ -4,6 +4,11 @@ import logging
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from match_store import refresh_local_store
+from sqlite_mirror import SqliteMirror
+from team_normalization import normalize_remote, report_totals
+from team_resolver import get_resolver
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -19,137 +24,63 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-# Normalization Map: Typo/Alias -> Normalized Name
-# COMPREHENSIVE MAP - includes all major leagues
-NORMALIZATION_MAP = {
-    # ========== SERIE A ==========
-    "Internazionale Milano": "Inter",
-    "Internazionale": "Inter",
-    "FC Internazionale": "Inter",
-    "Inter Milan": "Inter",
-    "AC Milan": "Milan",
-    "AC Milan Milano": "Milan",
-    "AS Roma": "Roma",
-    "SSC Napoli": "Napoli",
-    "Juventus FC": "Juventus",
-    "Hellas Verona": "Verona",
-    "Atalanta BC": "Atalanta",
-    "SS Lazio": "Lazio",
-    
-    # ========== PREMIER LEAGUE ==========
-    "Manchester City": "Man City",
-    "Manchester C": "Man City",
-    "Manchester United": "Man United",
-    "Manchester U": "Man United",
-    "Newcastle United": "Newcastle",
-    "Tottenham Hotspur": "Tottenham",
-    "Spurs": "Tottenham",
-    "West Ham United": "West Ham",
-    "Nottingham Forest": "Nott'm Forest",
-    "Nottingham": "Nott'm Forest",
-    "Wolverhampton": "Wolves",
-    "Wolverhampton Wanderers": "Wolves",
-    "Leicester City": "Leicester",
-    "Leeds United": "Leeds",
-    "Sheffield Utd": "Sheffield United",
-    "Brighton & Hove Albion": "Brighton",
-    "Brighton Hove Albion": "Brighton",
-    
-    # ========== LA LIGA ==========
-    "Athletic Bilbao": "Ath Bilbao",
-    "Athletic Club": "Ath Bilbao",
-    "Atletico Madrid": "Ath Madrid",
-    "Atlético Madrid": "Ath Madrid",
-    "Atlético de Madrid": "Ath Madrid",
-    "Real Sociedad": "Sociedad",
-    "Real Betis": "Betis",
-    "Rayo Vallecano": "Vallecano",
-    "Celta Vigo": "Celta",
-    "Villarreal CF": "Villarreal",
-    "Real Madrid CF": "Real Madrid",
-    
-    # ========== BUNDESLIGA ==========
-    "Bayern München": "Bayern Munich",
-    "FC Bayern": "Bayern Munich",
-    "Borussia Dortmund": "Dortmund",
-    "BVB": "Dortmund",
-    "Bayer Leverkusen": "Leverkusen",
-    "Bayer 04 Leverkusen": "Leverkusen",
-    "Bayer 04": "Leverkusen",
-    "04 Leverkusen": "Leverkusen",
-    "Borussia M'gladbach": "M'gladbach",
-    "Borussia Mönchengladbach": "M'gladbach",
-    "Eintracht Frankfurt": "Ein Frankfurt",
-    "Frankfurt": "Ein Frankfurt",
-    "TSG Hoffenheim": "Hoffenheim",
-    "VfL Wolfsburg": "Wolfsburg",
-    "SC Freiburg": "Freiburg",
-    "VfB Stuttgart": "Stuttgart",
-    "Mainz 05": "Mainz",
-    "1. FC Union Berlin": "Union Berlin",
-    
-    # ========== LIGUE 1 ==========
-    "Paris Saint-Germain": "Paris SG",
-    "PSG": "Paris SG",
-    "Saint-Germain": "Paris SG",
-    "Olympique de Marseille": "Marseille",
-    "Olympique Marseille": "Marseille",
-    "de Marseille": "Marseille",
-    "Olympique Lyon": "Lyon",
-    "Olympique Lyonnais": "Lyon",
-    "Saint-Etienne": "St Etienne",
-    "AS Monaco": "Monaco",
-    
-    # ========== EREDIVISIE ==========
-    "AZ Alkmaar": "AZ",
-    "PSV Eindhoven": "PSV",
-    "Ajax Amsterdam": "Ajax",
-    "AAjax": "Ajax",
-    
-    # ========== CHAMPIONS LEAGUE ==========
-    "Lisboa e Benfica": "Benfica",
-    "Sport Lisboa e Benfica": "Benfica",
-    "Clube de Portugal": "Sporting CP",
-    "Sporting": "Sporting CP",
-    "Club Brugge KV": "Club Brugge",
-    "FK Bodø/Glimt": "Bodø/Glimt",
-    "Qarabağ Ağdam FK": "Qarabag",
-    "Olympiakos SFP": "Olympiakos",
-    "Slavia Praha": "Slavia Prague",
-    "FC København": "Copenhagen",
-    "København": "Copenhagen",
-}
+# Normalization Map: Typo/Alias -> Normalized Name (shared resolver, config/team_aliases.json),
+# including the fragments left behind by old CL parsing - same map as sync_teams.py
+NORMALIZATION_MAP = get_resolver().alias_map(include_repairs=True)
 
 def normalize_database():
     logger.info("Starting database normalization...")
     
-    # Process both home_team and away_team
-    for old_name, new_name in NORMALIZATION_MAP.items():
-        logger.info(f"Normalizing '{old_name}' -> '{new_name}'...")
-        
-        # Update Home Team
-        res_h = supabase.table('matches').update({"home_team": new_name}).eq("home_team", old_name).execute()
-        updated_h = len(res_h.data) if res_h.data else 0
-        
-        # Update Away Team
-        res_a = supabase.table('matches').update({"away_team": new_name}).eq("away_team", old_name).execute()
-        updated_a = len(res_a.data) if res_a.data else 0
-        
-        if updated_h + updated_a > 0:
-            logger.info(f"  Fixed {updated_h} home and {updated_a} away records.")
+    # Whole map in one RPC: join-based UPDATE on home_team and away_team
+    results = normalize_remote(supabase, NORMALIZATION_MAP)
+    for row in results:
+        logger.info(f"  '{row['alias']}' -> '{row['canonical']}': {row['home_updated']} home and "
+                    f"{row['away_updated']} away records ({row['skipped']} left as duplicates).")
+    updated, skipped = report_totals(results)
+    logger.info(f"Renamed {updated} team slots ({skipped} skipped).")
 
     # Fix Cremonese League Code - Ensuring they are in Serie A (SA) as per user requirements
     logger.info("Moving Cremonese back to Serie A (SA)...")
-    res_h = supabase.table('matches').update({"league": "SA"}).eq("home_team", "Cremonese").execute()
-    res_a = supabase.table('matches').update({"league": "SA"}).eq("away_team", "Cremonese").execute()
+    res = supabase.table('matches').update({"league": "SA"}) \
+        .or_("home_team.eq.Cremonese,away_team.eq.Cremonese").execute()
     
-    total_fixed = (len(res_h.data) if res_h.data else 0) + (len(res_a.data) if res_a.data else 0)
+    total_fixed = len(res.data) if res.data else 0
     if total_fixed > 0:
         logger.info(f"  Corrected {total_fixed} matches for Cremonese to Serie A (SA).")
 
+    if updated or total_fixed:
+        refresh_local_store(supabase, "normalization")
     logger.info("Normalization complete!")
 
+def normalize_sqlite():
+    """Same normalization against the local mirror (data/magotto.sqlite)"""
+    mirror = SqliteMirror()
+    logger.info(f"Starting local mirror normalization ({mirror.path})...")
+
+    for old_name, new_name in NORMALIZATION_MAP.items():
+        # OR IGNORE: a rename that would collide with an existing canonical fixture is left for dedup
+        updated_h = mirror.execute("UPDATE OR IGNORE matches SET home_team = ? WHERE home_team = ?", (new_name, old_name))
+        updated_a = mirror.execute("UPDATE OR IGNORE matches SET away_team = ? WHERE away_team = ?", (new_name, old_name))
+        if updated_h + updated_a > 0:
+            logger.info(f"  '{old_name}' -> '{new_name}': {updated_h} home and {updated_a} away records.")
+
+    moved = mirror.execute(
+        "UPDATE matches SET league = 'SA' WHERE home_team = 'Cremonese' OR away_team = 'Cremonese'"
+    )
+    if moved > 0:
+        logger.info(f"  Corrected {moved} matches for Cremonese to Serie A (SA).")
+
+    logger.info("Local normalization complete!")
+
 
 
 if __name__ == "__main__":
-    normalize_database()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Normalize team names")
+    parser.add_argument("--backend", choices=["supabase", "sqlite"], default="supabase")
+    args = parser.parse_args()
+    if args.backend == "sqlite":
+        normalize_sqlite()
+    else:
+        normalize_database()
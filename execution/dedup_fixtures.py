@@ -0,0 +1,157 @@
+"""
+DEDUP FIXTURES - Deduplica delle partite dopo la normalizzazione dei nomi
+Rows ingested under an alias ("Inter Milan") duplicate the canonical row
+of the same fixture, and normalize_team_names skips renames that would
+collide with it. This job reads the whole table once (keyset pages),
+groups rows by canonical fixture key (date + resolver-canonical home and
+away team) in a hash map, keeps one survivor per group and deletes the
+rest with batched `id in (...)` statements.
+
+Survivor rule, in order:
+  1. both team names already canonical (no rename needed)
+  2. most complete row: goals present, non-zero xG, league and season set
+  3. lowest id (first ingested)
+
+After the deletes the alias map is applied once more, so survivors still
+carrying an alias get the canonical name (the collision is gone).
+
+Usage:
+    python execution/dedup_fixtures.py --dry-run
+    python execution/dedup_fixtures.py
+    python execution/dedup_fixtures.py --postgres
+"""
+
+import os
+import sys
+import json
+from dataclasses import dataclass
+
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+from match_store import refresh_local_store
+from pg_writer import open_pg_writer
+from table_reader import DEFAULT_WORKERS, iter_table
+from team_normalization import RPC_NAME, normalize_remote, report_totals
+from team_resolver import get_resolver
+
+COLUMNS = "id, date, home_team, away_team, home_goals, away_goals, home_xg, away_xg, league, season"
+DELETE_BATCH = 500   # ids per DELETE ... WHERE id IN (...), well inside URL limits
+
+
+@dataclass
+class DuplicateGroup:
+    key: tuple[str, str, str]
+    survivor: dict
+    losers: list[dict]
+
+
+def _filled(value) -> bool:
+    return value is not None and float(value) != 0
+
+
+def survivor_rank(row: dict, resolve) -> tuple:
+    """Sort key: smaller is better (see module docstring)"""
+    canonical = resolve(row["home_team"]) == row["home_team"] and resolve(row["away_team"]) == row["away_team"]
+    completeness = sum((
+        row.get("home_goals") is not None and row.get("away_goals") is not None,
+        _filled(row.get("home_xg")) or _filled(row.get("away_xg")),
+        bool(row.get("league")),
+        bool(row.get("season")),
+    ))
+    return (not canonical, -completeness, row["id"])
+
+
+def find_duplicates(rows) -> list[DuplicateGroup]:
+    resolver = get_resolver()
+    resolve = resolver.resolve
+    groups: dict[tuple[str, str, str], list[dict]] = {}
+    for row in rows:
+        key = (str(row["date"])[:10], resolve(row["home_team"]), resolve(row["away_team"]))
+        groups.setdefault(key, []).append(row)
+
+    duplicates = []
+    for key, members in groups.items():
+        if len(members) < 2:
+            continue
+        ranked = sorted(members, key=lambda r: survivor_rank(r, resolve))
+        duplicates.append(DuplicateGroup(key, ranked[0], ranked[1:]))
+    duplicates.sort(key=lambda g: g.key)
+    return duplicates
+
+
+def delete_ids(client: Client, ids: list[int]) -> int:
+    deleted = 0
+    for start in range(0, len(ids), DELETE_BATCH):
+        batch = ids[start:start + DELETE_BATCH]
+        result = client.table("matches").delete().in_("id", batch).execute()
+        deleted += len(result.data or [])
+    return deleted
+
+
+def print_summary(groups: list[DuplicateGroup], limit: int | None):
+    total = sum(len(g.losers) for g in groups)
+    print(f"\n📊 Partite duplicate: {len(groups)} gruppi, {total} righe da eliminare")
+    for group in groups[:limit]:
+        date, home, away = group.key
+        s = group.survivor
+        losers = ", ".join(f"#{r['id']} ({r['home_team']} - {r['away_team']})" for r in group.losers)
+        print(f"   {date} {home} vs {away}: tengo #{s['id']} ({s['home_team']} - {s['away_team']}), elimino {losers}")
+    if limit is not None and len(groups) > limit:
+        print(f"   ... e altri {len(groups) - limit} gruppi (--show-all per l'elenco completo)")
+
+
+def dedup(dry_run: bool = False, postgres: bool = False, show: int | None = 20) -> dict:
+    load_dotenv()
+    url = os.getenv("VITE_SUPABASE_URL")
+    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    if not url or not key:
+        print("❌ Missing Supabase credentials (need SERVICE_ROLE_KEY)")
+        sys.exit(1)
+    supabase: Client = create_client(url, key)
+
+    print("\n" + "="*60)
+    print("🧹 MAGOTTO - DEDUPLICA PARTITE" + (" (dry-run)" if dry_run else ""))
+    print("="*60)
+
+    groups = find_duplicates(iter_table(supabase, "matches", COLUMNS, workers=DEFAULT_WORKERS))
+    print_summary(groups, show)
+    loser_ids = sorted(r["id"] for g in groups for r in g.losers)
+    summary = {"groups": len(groups), "to_delete": len(loser_ids), "deleted": 0, "renamed": 0}
+
+    if dry_run or not loser_ids:
+        return summary
+
+    aliases = get_resolver().alias_map(include_repairs=True)
+    if postgres:
+        writer = open_pg_writer()
+        if writer is None:
+            sys.exit(1)
+        with writer:
+            summary["deleted"] = writer.delete_ids("matches", loser_ids)
+            results = writer.select(f"SELECT * FROM {RPC_NAME}(%s::jsonb)", (json.dumps(aliases),))
+    else:
+        summary["deleted"] = delete_ids(supabase, loser_ids)
+        try:
+            results = normalize_remote(supabase, aliases)
+        except Exception as e:
+            print(f"⚠️ {RPC_NAME} not available ({e}); survivors keep their current names")
+            results = []
+
+    summary["renamed"], skipped = report_totals(results)
+    print(f"\n✅ Eliminate {summary['deleted']} righe, rinominate {summary['renamed']}"
+          + (f" ({skipped} rinomine ancora in collisione)" if skipped else ""))
+    refresh_local_store(supabase, "dedup")
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Deduplica partite con nomi canonici uguali")
+    parser.add_argument("--dry-run", action="store_true", help="Solo riepilogo, nessuna modifica")
+    parser.add_argument("--postgres", action="store_true",
+                        help="Elimina con una connessione Postgres diretta (SUPABASE_DB_URL)")
+    parser.add_argument("--show-all", action="store_true", help="Elenca tutti i gruppi duplicati")
+    args = parser.parse_args()
+    dedup(args.dry_run, args.postgres, None if args.show_all else 20)
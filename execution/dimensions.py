@@ -0,0 +1,253 @@
+"""
+DIMENSIONS - Id interi per squadre, campionati e stagioni
+Python side of frontend/sql/10_dimensions.sql:
+
+  - Dimension / Dimensions: name <-> id maps for `teams`, `leagues` and
+    `seasons`, loaded once per run. The ingest attaches home_team_id,
+    away_team_id, league_id and season_id to the rows it writes, chunk by
+    chunk: the names not seen yet are inserted with one bulk upsert per
+    dimension. When that fails (e.g. anon key: only admins may write the
+    dimension tables) the ids stay NULL and the matches_resolve_ids
+    trigger fills them from the names.
+  - FixtureArray: columnar, int-array encoding of a set of fixtures
+    (dates as day ordinals, teams/league/season as ids, goals as bytes),
+    with a per-team row index for history lookups. About 20 bytes per
+    fixture instead of several hundred for a dict of strings.
+"""
+
+import threading
+from array import array
+from datetime import date
+from itertools import islice
+
+from table_reader import DEFAULT_WORKERS, iter_table
+
+FIXTURE_COLUMNS = "id, date, home_team_id, away_team_id, league_id, season_id, home_goals, away_goals"
+ATTACH_CHUNK = 500
+
+
+class Dimension:
+    """One dimension table: `key` column (name/code) <-> integer id"""
+
+    def __init__(self, table: str, key: str):
+        self.table = table
+        self.key = key
+        self.ids: dict[str, int] = {}
+        self.names: dict[int, str] = {}
+        self._next_local = 1
+        self._lock = threading.Lock()
+        self.writable = True
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, id_: int, name: str):
+        self.ids[name] = id_
+        self.names[id_] = name
+        self._next_local = max(self._next_local, id_ + 1)
+
+    def load(self, client):
+        for row in iter_table(client, self.table, f"id, {self.key}"):
+            self.add(row["id"], row[self.key])
+        return self
+
+    def resolve_many(self, client, names) -> None:
+        """Insert every unseen name with one bulk upsert; on failure leave them unresolved (ids NULL -> trigger)"""
+        with self._lock:
+            missing = sorted({name for name in names if name is not None and name not in self.ids})
+            if not missing or not self.writable:
+                return
+            try:
+                result = client.table(self.table).upsert(
+                    [{self.key: name} for name in missing], on_conflict=self.key).execute()
+            except Exception as e:
+                self.writable = False
+                print(f"⚠️ Cannot write {self.table} ({e}); new ids left to the matches_resolve_ids trigger")
+                return
+            for row in result.data or []:
+                self.add(row["id"], row[self.key])
+
+    def resolve(self, client, name: str) -> int | None:
+        """Id for `name`, inserting it into the table the first time it is seen (None if that is not allowed)"""
+        if name is None:
+            return None
+        if name not in self.ids:
+            self.resolve_many(client, [name])
+        return self.ids.get(name)
+
+    def intern(self, name: str) -> int:
+        """Local-only id (no database): next free integer"""
+        id_ = self.ids.get(name)
+        if id_ is None:
+            id_ = self._next_local
+            self.add(id_, name)
+        return id_
+
+
+class Dimensions:
+    def __init__(self):
+        self.teams = Dimension("teams", "name")
+        self.leagues = Dimension("leagues", "code")
+        self.seasons = Dimension("seasons", "name")
+
+    def load(self, client) -> "Dimensions":
+        for dimension in (self.teams, self.leagues, self.seasons):
+            dimension.load(client)
+        return self
+
+    def attach_ids(self, client, row: dict) -> dict:
+        """Add home_team_id, away_team_id, league_id, season_id to a match row"""
+        return self.attach_ids_many(client, [row])[0]
+
+    def attach_ids_many(self, client, rows: list[dict]) -> list[dict]:
+        """attach_ids for a list of rows: one bulk upsert per dimension for the unseen names"""
+        self.teams.resolve_many(client, [r["home_team"] for r in rows] + [r["away_team"] for r in rows])
+        self.leagues.resolve_many(client, [r.get("league") for r in rows])
+        self.seasons.resolve_many(client, [r.get("season") for r in rows])
+        for row in rows:
+            row["home_team_id"] = self.teams.ids.get(row["home_team"])
+            row["away_team_id"] = self.teams.ids.get(row["away_team"])
+            row["league_id"] = self.leagues.ids.get(row.get("league"))
+            row["season_id"] = self.seasons.ids.get(row.get("season"))
+        return rows
+
+    def attach_ids_stream(self, client, rows, chunk: int = ATTACH_CHUNK):
+        """attach_ids over an iterable, ATTACH_CHUNK rows at a time (constant memory, few round trips)"""
+        rows = iter(rows)
+        while batch := list(islice(rows, chunk)):
+            yield from self.attach_ids_many(client, batch)
+
+
+def try_load_dimensions(client) -> Dimensions | None:
+    """Dimensions from the database, or None when 10_dimensions.sql has not been applied"""
+    try:
+        return Dimensions().load(client)
+    except Exception as e:
+        print(f"⚠️ Dimension tables not available ({e}); writing team names only")
+        return None
+
+
+class FixtureArray:
+    """Compact columnar fixtures: one typed array per column, ids instead of strings"""
+
+    def __init__(self, dims: Dimensions):
+        self.dims = dims
+        self.date = array("i")
+        self.home = array("i")
+        self.away = array("i")
+        self.league = array("h")
+        self.season = array("h")
+        self.home_goals = array("b")
+        self.away_goals = array("b")
+        self._by_team: dict[int, array] | None = None
+
+    def __len__(self):
+        return len(self.date)
+
+    @property
+    def nbytes(self) -> int:
+        columns = (self.date, self.home, self.away, self.league, self.season, self.home_goals, self.away_goals)
+        return sum(col.itemsize * len(col) for col in columns)
+
+    def append(self, day: int, home: int, away: int, league: int, season: int, home_goals: int, away_goals: int):
+        self.date.append(day)
+        self.home.append(home)
+        self.away.append(away)
+        self.league.append(league)
+        self.season.append(season)
+        self.home_goals.append(home_goals)
+        self.away_goals.append(away_goals)
+        self._by_team = None
+
+    @classmethod
+    def from_rows(cls, rows, dims: Dimensions | None = None) -> "FixtureArray":
+        """Encode name-based rows (Supabase / local backends), interning names locally when needed"""
+        dims = dims or Dimensions()
+        fixtures = cls(dims)
+        for row in rows:
+            fixtures.append(
+                date.fromisoformat(str(row["date"])[:10]).toordinal() if row.get("date") else 0,
+                dims.teams.intern(row["home_team"]),
+                dims.teams.intern(row["away_team"]),
+                dims.leagues.intern(row["league"]) if row.get("league") else 0,
+                dims.seasons.intern(row["season"]) if row.get("season") else 0,
+                row.get("home_goals") or 0,
+                row.get("away_goals") or 0,
+            )
+        return fixtures
+
+    @classmethod
+    def from_id_rows(cls, rows, dims: Dimensions) -> "FixtureArray":
+        """Encode rows already carrying the *_id columns"""
+        fixtures = cls(dims)
+        for row in rows:
+            fixtures.append(
+                date.fromisoformat(str(row["date"])[:10]).toordinal(),
+                row["home_team_id"], row["away_team_id"],
+                row.get("league_id") or 0, row.get("season_id") or 0,
+                row.get("home_goals") or 0, row.get("away_goals") or 0,
+            )
+        return fixtures
+
+    def _team_index(self) -> dict[int, array]:
+        if self._by_team is None:
+            index: dict[int, array] = {}
+            for i, (home, away) in enumerate(zip(self.home, self.away)):
+                index.setdefault(home, array("i")).append(i)
+                index.setdefault(away, array("i")).append(i)
+            self._by_team = index
+        return self._by_team
+
+    def history(self, team_id: int) -> list[int]:
+        """Row positions of a team's fixtures, oldest first"""
+        return sorted(self._team_index().get(team_id, ()), key=self.date.__getitem__)
+
+    def team_ids(self, league_id: int | None = None, season_id: int | None = None) -> set[int]:
+        ids = set()
+        for i in range(len(self)):
+            if (league_id is None or self.league[i] == league_id) and \
+               (season_id is None or self.season[i] == season_id):
+                ids.add(self.home[i])
+                ids.add(self.away[i])
+        return ids
+
+    def teams_by_league(self) -> dict[str, set[str]]:
+        """{league code: {team names}} decoded through the dimensions"""
+        by_league: dict[int, set[int]] = {}
+        for league, home, away in zip(self.league, self.home, self.away):
+            bucket = by_league.setdefault(league, set())
+            bucket.add(home)
+            bucket.add(away)
+        names = self.dims.teams.names
+        return {
+            self.dims.leagues.names.get(league, "Unknown"): {names[t] for t in teams}
+            for league, teams in by_league.items()
+        }
+
+    def team_counts(self) -> dict[str, int]:
+        """{team name: number of fixtures}"""
+        counts: dict[int, int] = {}
+        for home, away in zip(self.home, self.away):
+            counts[home] = counts.get(home, 0) + 1
+            counts[away] = counts.get(away, 0) + 1
+        names = self.dims.teams.names
+        return {names[t]: n for t, n in counts.items()}
+
+    def row(self, i: int) -> dict:
+        teams = self.dims.teams.names
+        return {
+            "date": date.fromordinal(self.date[i]).isoformat(),
+            "home_team": teams[self.home[i]],
+            "away_team": teams[self.away[i]],
+            "home_goals": self.home_goals[i],
+            "away_goals": self.away_goals[i],
+            "league": self.dims.leagues.names.get(self.league[i]),
+            "season": self.dims.seasons.names.get(self.season[i]),
+        }
+
+
+def load_fixtures(client, dims: Dimensions | None = None) -> FixtureArray:
+    """All matches as a FixtureArray, transferring ids only (no team-name strings)"""
+    dims = dims or Dimensions().load(client)
+    rows = iter_table(client, "matches", FIXTURE_COLUMNS, workers=DEFAULT_WORKERS)
+    return FixtureArray.from_id_rows(rows, dims)
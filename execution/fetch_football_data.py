@@ -1,10 +1,27 @@
 import os
 import csv
+import hashlib
+import argparse
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime
+from requests.adapters import HTTPAdapter
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from csv_cache import RawCsvCache
+from csv_features import NUMPY_AVAILABLE, extract_season
+from dimensions import Dimensions, try_load_dimensions
+from ingest_pipeline import IngestPipeline, Stage
+from ingest_manifest import IngestManifest, unit_key
+from match_store import MatchStore, open_existing_store, open_store
+from pg_writer import PgWriter, open_pg_writer
+from sqlite_mirror import SqliteMirror
+from table_reader import iter_table
+from team_resolver import resolve_team
+
 # Load environment variables
 load_dotenv()
 
@@ -42,6 +59,17 @@ SEASONS = [
     {"code": "1617", "name": "2016-2017"},
 ]
 
+BASE_URL = "https://www.football-data.co.uk/mmz4281/{season}/{file}"
+REQUEST_TIMEOUT = 30
+DEFAULT_WORKERS = 1
+DEFAULT_WRITERS = 2
+DEFAULT_PARSERS = 2
+DEFAULT_QUEUE_SIZE = 4
+DEFAULT_CHUNK_SIZE = 200
+MIN_CHUNK_SIZE = 10
+MAX_CHUNK_SIZE = 1000
+STREAM_CHUNK_BYTES = 64 * 1024
+
 LEAGUE_CONFIGS = [
     {"name": "Premier League", "code": "PL", "file": "E0.csv"},
     {"name": "Serie A", "code": "SA", "file": "I1.csv"},
@@ -63,105 +91,597 @@ def parse_date(date_str):
     except Exception:
         return None
 
-def fetch_and_insert():
-    total_matches = 0
-    total_seasons = 0
+def build_session(pool_size=DEFAULT_WORKERS):
+    """Shared HTTP session with a connection pool sized for the download workers"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@dataclass
+class IngestContext:
+    """Per-run state shared by the download and write paths"""
+    session: requests.Session
+    sizer: "ChunkSizer"
+    cache: RawCsvCache | None = None
+    force: bool = False
+    incremental: bool = False
+    manifest: IngestManifest | None = None
+    store: MatchStore | None = None
+    sqlite: SqliteMirror | None = None
+    features: bool = False
+    pg: PgWriter | None = None
+    dims: Dimensions | None = None
+
+    def close(self):
+        if self.pg:
+            self.pg.close()
+
+    def mark(self, season, league, status, rows=0, sha256=None, error=None):
+        if self.manifest:
+            self.manifest.mark(unit_key(league["code"], season["code"]), status, rows, sha256, error)
+
+class ChunkSizer:
+    """
+    Adaptive upsert chunk size: grows after each successful flush and halves
+    on payload-too-large / timeout errors. Shared by all writer threads.
+    """
+
+    def __init__(self, initial=DEFAULT_CHUNK_SIZE, minimum=MIN_CHUNK_SIZE, maximum=MAX_CHUNK_SIZE):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.size = max(minimum, min(initial, maximum))
+        self._lock = threading.Lock()
+
+    def grow(self):
+        with self._lock:
+            self.size = min(self.maximum, self.size + max(self.size // 2, 1))
+
+    def shrink(self, failed_size):
+        with self._lock:
+            self.size = max(self.minimum, min(self.size, failed_size) // 2)
+            return self.size
+
+def is_chunk_size_error(error):
+    """Errors that a smaller payload can fix: HTTP 413, gateway/statement timeouts"""
+    if "timeout" in type(error).__name__.lower():
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in (
+        "413", "payload too large", "request entity too large",
+        "timeout", "timed out", "57014", "504",
+    ))
+
+def iter_matches(lines, season, league):
+    """Yield match dicts one CSV row at a time from an iterable of text lines"""
+    reader = csv.reader(lines, delimiter=',')
+    header_row = next(reader, None)
+    if not header_row:
+        return
 
-    for season in SEASONS:
-        for league in LEAGUE_CONFIGS:
-            url = f"https://www.football-data.co.uk/mmz4281/{season['code']}/{league['file']}"
-            print(f"\n📥 Fetching {league['name']} {season['name']} from {url}...")
+    headers = [h.strip() for h in header_row]
 
+    try:
+        date_idx = headers.index('Date')
+        home_idx = headers.index('HomeTeam')
+        away_idx = headers.index('AwayTeam')
+        fthg_idx = headers.index('FTHG')
+        ftag_idx = headers.index('FTAG')
+        hs_idx = headers.index('HS') if 'HS' in headers else -1
+        as_idx = headers.index('AS') if 'AS' in headers else -1
+        hst_idx = headers.index('HST') if 'HST' in headers else -1
+        ast_idx = headers.index('AST') if 'AST' in headers else -1
+    except ValueError as e:
+        print(f"❌ CSV format error: {e}")
+        return
+
+    for row in reader:
+        if len(row) < 5:
+            continue
+
+        iso_date = parse_date(row[date_idx])
+        if not iso_date:
+            continue
+
+        home_team = row[home_idx]
+        away_team = row[away_idx]
+        if not home_team or not away_team:
+            continue
+
+        try:
+            fthg = int(row[fthg_idx])
+            ftag = int(row[ftag_idx])
+        except ValueError:
+            continue
+
+        # xG estimation logic
+        home_xg = 0
+        away_xg = 0
+        if hst_idx != -1 and hs_idx != -1:
             try:
-                response = requests.get(url)
-                if response.status_code != 200:
-                    print(f"❌ Failed to fetch: {response.status_code}")
-                    continue
-
-                decoded_content = response.content.decode('utf-8')
-                cr = csv.reader(decoded_content.splitlines(), delimiter=',')
-                rows = list(cr)
-                if not rows:
-                    continue
-
-                headers = [h.strip() for h in rows[0]]
-                
-                try:
-                    date_idx = headers.index('Date')
-                    home_idx = headers.index('HomeTeam')
-                    away_idx = headers.index('AwayTeam')
-                    fthg_idx = headers.index('FTHG')
-                    ftag_idx = headers.index('FTAG')
-                    hs_idx = headers.index('HS') if 'HS' in headers else -1
-                    as_idx = headers.index('AS') if 'AS' in headers else -1
-                    hst_idx = headers.index('HST') if 'HST' in headers else -1
-                    ast_idx = headers.index('AST') if 'AST' in headers else -1
-                except ValueError as e:
-                    print(f"❌ CSV format error: {e}")
-                    continue
-
-                matches = []
-                for row in rows[1:]:
-                    if len(row) < 5:
-                        continue
-                    
-                    iso_date = parse_date(row[date_idx])
-                    if not iso_date:
-                        continue
-
-                    home_team = row[home_idx]
-                    away_team = row[away_idx]
-                    if not home_team or not away_team:
-                        continue
-
-                    try:
-                        fthg = int(row[fthg_idx])
-                        ftag = int(row[ftag_idx])
-                    except ValueError:
-                        continue
-
-                    # xG estimation logic
-                    home_xg = 0
-                    away_xg = 0
-                    if hst_idx != -1 and hs_idx != -1:
-                        try:
-                            hst = float(row[hst_idx])
-                            hs = float(row[hs_idx])
-                            ast = float(row[ast_idx])
-                            as_val = float(row[as_idx])
-                            
-                            home_xg = round((hst * 0.32) + ((hs - hst) * 0.04), 2)
-                            away_xg = round((ast * 0.32) + ((as_val - ast) * 0.04), 2)
-                        except (ValueError, IndexError):
-                            pass
-
-                    matches.append({
-                        "date": iso_date,
-                        "home_team": home_team,
-                        "away_team": away_team,
-                        "home_goals": fthg,
-                        "away_goals": ftag,
-                        "home_xg": home_xg,
-                        "away_xg": away_xg,
-                        "league": league["code"],
-                        "season": season["name"]
-                    })
-
-                if matches:
-                    print(f"✅ Parsed {len(matches)} matches. Upserting to Supabase...")
-                    result = supabase.table("matches").upsert(matches, on_conflict="date,home_team,away_team").execute()
-                    total_matches += len(matches)
-                    total_seasons += 1
-                    print(f"✅ Success for {league['name']} {season['name']}")
+                hst = float(row[hst_idx])
+                hs = float(row[hs_idx])
+                ast = float(row[ast_idx])
+                as_val = float(row[as_idx])
 
-            except Exception as e:
-                print(f"❌ Error processing {league['name']}: {e}")
+                home_xg = round((hst * 0.32) + ((hs - hst) * 0.04), 2)
+                away_xg = round((ast * 0.32) + ((as_val - ast) * 0.04), 2)
+            except (ValueError, IndexError):
+                pass
+
+        yield {
+            "date": iso_date,
+            "home_team": home_team,
+            "away_team": away_team,
+            "home_goals": fthg,
+            "away_goals": ftag,
+            "home_xg": home_xg,
+            "away_xg": away_xg,
+            "league": league["code"],
+            "season": season["name"]
+        }
+
+def normalize_match(match):
+    """Canonical team names before the row is written (shared resolver)"""
+    match["home_team"] = resolve_team(match["home_team"])
+    match["away_team"] = resolve_team(match["away_team"])
+    return match
+
+def _decode_lines(raw_lines):
+    for line in raw_lines:
+        yield line.decode('utf-8')
+
+def fetch_raw_csv(ctx, season, league):
+    """
+    Stream one league-season CSV. With a cache, the body is streamed to disk
+    behind a conditional GET and None is returned when the content was
+    already ingested (unless `force`). Returns (lines, sha256) or None, where
+    `lines` lazily yields decoded text lines.
+    """
+    cache = ctx.cache
+    url = BASE_URL.format(season=season['code'], file=league['file'])
+    print(f"\n📥 Fetching {league['name']} {season['name']} from {url}...")
+
+    meta = cache.load_meta(season['code'], league['file']) if cache else {}
+    headers = {} if ctx.force else RawCsvCache.conditional_headers(meta)
+
+    response = ctx.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True)
+    if response.status_code == 304:
+        response.close()
+        if RawCsvCache.is_ingested(meta):
+            print(f"⏭️  {league['name']} {season['name']} not modified (304), skipping")
+            return None
+        if cache.has_body(season['code'], league['file']):
+            return cache.iter_lines(season['code'], league['file']), meta['sha256']
+        # Meta without body on disk: fall back to a plain GET
+        response = ctx.session.get(url, timeout=REQUEST_TIMEOUT, stream=True)
+
+    if response.status_code >= 500:
+        # Server-side blip: fail the unit so --resume retries it
+        response.close()
+        response.raise_for_status()
+    if response.status_code != 200:
+        print(f"❌ Failed to fetch {league['name']} {season['name']}: {response.status_code}")
+        response.close()
+        return None
+
+    if not cache:
+        # No cache: parse straight off the socket, the hash is never needed
+        return _decode_lines(response.iter_lines()), None
+
+    with response:
+        meta = cache.store(season['code'], league['file'],
+                           response.iter_content(chunk_size=STREAM_CHUNK_BYTES), response.headers)
+    if not ctx.force and RawCsvCache.is_ingested(meta):
+        print(f"⏭️  {league['name']} {season['name']} unchanged (same content hash), skipping")
+        return None
+    return cache.iter_lines(season['code'], league['file']), meta['sha256']
+
+def download_league_season(ctx, season, league):
+    """Download one league-season. Returns a batch with a lazy row stream, or None if unavailable/unchanged."""
+    raw = fetch_raw_csv(ctx, season, league)
+    if raw is None:
+        ctx.mark(season, league, "skipped")
+        return None
+
+    lines, sha256 = raw
+    batch = {"season": season, "league": league, "sha256": sha256}
+    if ctx.features:
+        # Whole season in one vectorised pass; also yields the wide feature rows
+        matches, features = extract_season(lines, season, league, parse_date)
+        batch["rows"] = [normalize_match(m) for m in matches]
+        batch["features"] = [normalize_match(f) for f in features]
+    else:
+        batch["rows"] = (normalize_match(m) for m in iter_matches(lines, season, league))
+    return batch
+
+def upsert_rows(rows, table="matches"):
+    supabase.table(table).upsert(rows, on_conflict="date,home_team,away_team").execute()
+
+def _flush_chunk(chunk, sizer, table):
+    try:
+        upsert_rows(chunk, table)
+    except Exception as e:
+        if not is_chunk_size_error(e) or len(chunk) <= sizer.minimum:
+            raise
+        step = sizer.shrink(len(chunk))
+        print(f"⚠️  Upsert of {len(chunk)} rows failed ({e}); retrying in chunks of {step}")
+        return sum(_flush_chunk(chunk[i:i + step], sizer, table) for i in range(0, len(chunk), step))
+    sizer.grow()
+    return len(chunk)
+
+def upsert_stream(rows, sizer, table="matches"):
+    """Flush a row stream to Supabase in adaptive chunks. Returns the number of rows written."""
+    written = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= sizer.size:
+            written += _flush_chunk(chunk, sizer, table)
+            chunk = []
+    if chunk:
+        written += _flush_chunk(chunk, sizer, table)
+    return written
+
+def write_rows(ctx, rows, table="matches"):
+    """COPY + merge over the direct connection when configured, else adaptive PostgREST upserts"""
+    if ctx.pg:
+        return ctx.pg.upsert(table, rows)
+    return upsert_stream(rows, ctx.sizer, table)
+
+def match_key(match):
+    return (str(match["date"])[:10], match["home_team"], match["away_team"])
+
+def row_fingerprint(match):
+    """Hash of the mutable columns; numeric values are normalised so DB and CSV rows compare equal"""
+    values = (
+        int(match.get("home_goals") or 0),
+        int(match.get("away_goals") or 0),
+        round(float(match.get("home_xg") or 0), 2),
+        round(float(match.get("away_xg") or 0), 2),
+    )
+    return hashlib.sha1(repr(values).encode("utf-8")).hexdigest()
+
+def fetch_existing_fingerprints(league_code, season_name):
+    """All keys + fingerprints of a league-season (one page for ~380 rows, keyset-paged beyond the 1000-row cap)"""
+    rows = iter_table(supabase, "matches", "date, home_team, away_team, home_goals, away_goals, home_xg, away_xg",
+                      filters={"league": league_code, "season": season_name})
+    return {match_key(row): row_fingerprint(row) for row in rows}
+
+def diff_matches(matches, existing):
+    """Keep only rows that are new or whose fingerprint differs from the stored one"""
+    return (m for m in matches if existing.get(match_key(m)) != row_fingerprint(m))
+
+def _tee(rows, sink):
+    for row in rows:
+        sink.append(row)
+        yield row
+
+def write_batch(ctx, batch):
+    """Stream a batch into Supabase and, once it is in the database, mark its CSV as ingested"""
+    season, league = batch["season"], batch["league"]
+    parsed = 0
+
+    def counted(rows):
+        nonlocal parsed
+        for row in rows:
+            parsed += 1
+            yield row
+
+    rows = counted(batch["rows"])
+    if ctx.incremental:
+        existing = fetch_existing_fingerprints(league["code"], season["name"])
+        rows = diff_matches(rows, existing)
+
+    if ctx.dims:
+        # Integer team/league/season ids alongside the names (10_dimensions.sql)
+        rows = ctx.dims.attach_ids_stream(supabase, rows)
 
+    features = batch.get("features")
+    mirrored = []
+    if ctx.store or ctx.sqlite or features:
+        rows = _tee(rows, mirrored)
+
+    written = write_rows(ctx, rows)
+    if mirrored:
+        # Keep the local mirrors in step with what reached Supabase
+        if ctx.store:
+            ctx.store.upsert(mirrored)
+        if ctx.sqlite:
+            ctx.sqlite.upsert_matches(mirrored)
+    if features:
+        written_keys = {match_key(m) for m in mirrored}
+        write_rows(ctx, (f for f in features if match_key(f) in written_keys), table="match_features")
+    if ctx.incremental:
+        print(f"🔁 {league['name']} {season['name']}: {written} new/changed of {parsed} rows")
+    if ctx.cache and batch["sha256"]:
+        ctx.cache.mark_ingested(season['code'], league['file'], batch["sha256"])
+    ctx.mark(season, league, "done", parsed, batch["sha256"])
+    return written
+
+def process_league_season(ctx, season, league):
+    """Serial unit of work: download, parse and upsert one league-season"""
+    batch = download_league_season(ctx, season, league)
+    if not batch:
+        return 0
+
+    print(f"⏳ Streaming {league['name']} {season['name']} to Supabase...")
+    count = write_batch(ctx, batch)
+    print(f"✅ Success for {league['name']} {season['name']} ({count} matches)")
+    return count
+
+def parse_unit_selector(selector):
+    """'SA:2425' -> (season, league) config pair"""
+    try:
+        league_code, season_code = selector.split(":")
+        league = next(l for l in LEAGUE_CONFIGS if l["code"] == league_code.strip().upper())
+        season = next(s for s in SEASONS if s["code"] == season_code.strip())
+    except (ValueError, StopIteration):
+        raise ValueError(f"Invalid unit '{selector}' (expected LEAGUE:SEASON, e.g. SA:2425)")
+    return season, league
+
+def prepare_run(workers=DEFAULT_WORKERS, use_cache=True, force=False, incremental=False,
+                chunk_size=DEFAULT_CHUNK_SIZE, resume=False, only=None, local_store=True,
+                sqlite=False, features=False, postgres=False):
+    """
+    Build the run context and the list of units to process. The manifest in
+    data/ingest_manifest.json is reset on a fresh run; with `resume` completed
+    units are skipped. `only` re-runs the selected units (forcing re-ingest)
+    and leaves the other manifest entries untouched.
+    """
+    if only:
+        units = [parse_unit_selector(sel) for sel in only]
+        force = True
+    else:
+        units = [(season, league) for season in SEASONS for league in LEAGUE_CONFIGS]
+
+    if features and not NUMPY_AVAILABLE:
+        print("⚠️ --features needs numpy; continuing without match_features")
+        features = False
+
+    pg = None
+    if postgres:
+        pg = open_pg_writer()
+        if not pg:
+            exit(1)
+        print("🐘 Writing through a direct Postgres connection (COPY + merge)")
+
+    manifest = IngestManifest()
+    manifest.start([unit_key(l["code"], s["code"]) for s, l in units], resume=resume, keep_others=bool(only))
+    if resume:
+        remaining = [(s, l) for s, l in units if not manifest.is_complete(unit_key(l["code"], s["code"]))]
+        print(f"⏯️  Resuming: {len(units) - len(remaining)} units already complete, {len(remaining)} to go")
+        units = remaining
+
+    # Write through only to a store built by a full sync: incremental runs and
+    # cached units never see every row, so the ingest must not create it
+    store = open_existing_store() if local_store else None
+    if local_store and store is None and open_store() is not None:
+        print("ℹ️  Local Parquet store not built yet: python execution/match_store.py --sync")
+
+    ctx = IngestContext(
+        session=build_session(max(workers, 1)),
+        sizer=ChunkSizer(initial=chunk_size),
+        cache=RawCsvCache() if use_cache else None,
+        force=force,
+        incremental=incremental,
+        manifest=manifest,
+        store=store,
+        sqlite=SqliteMirror() if sqlite else None,
+        features=features,
+        pg=pg,
+        dims=try_load_dimensions(supabase),
+    )
+    return ctx, units
+
+def print_summary(ctx, total_matches, total_seasons):
     print(f"\n{'='*50}")
     print(f"🏆 IMPORT COMPLETE!")
     print(f"📊 Total Matches: {total_matches}")
     print(f"📅 Seasons Processed: {total_seasons}")
+    if ctx.manifest:
+        print(f"🗂️  Manifest: {ctx.manifest.summary()}")
     print(f"{'='*50}")
 
+def fetch_and_insert(workers=DEFAULT_WORKERS, writers=DEFAULT_WRITERS, use_cache=True, force=False,
+                     incremental=False, chunk_size=DEFAULT_CHUNK_SIZE, resume=False, only=None,
+                     local_store=True, sqlite=False, features=False, postgres=False):
+    total_matches = 0
+    total_seasons = 0
+
+    ctx, units = prepare_run(workers, use_cache, force, incremental, chunk_size, resume, only,
+                             local_store, sqlite, features, postgres)
+
+    if workers <= 1:
+        for season, league in units:
+            try:
+                count = process_league_season(ctx, season, league)
+                if count:
+                    total_matches += count
+                    total_seasons += 1
+            except Exception as e:
+                print(f"❌ Error processing {league['name']}: {e}")
+                ctx.mark(season, league, "failed", error=str(e))
+    else:
+        total_matches, total_seasons = _fetch_concurrent(ctx, units, workers, writers)
+
+    print_summary(ctx, total_matches, total_seasons)
+    ctx.close()
+
+def _fetch_concurrent(ctx, units, workers, writers):
+    """
+    Download league-seasons on `workers` threads and hand the batches to a
+    pool of `writers` upsert threads, which parse and flush them in chunks.
+    At most `writers * 2` batches wait for the database at any time, so fast
+    downloads cannot flood Supabase.
+    """
+    total_matches = 0
+    total_seasons = 0
+    write_slots = threading.BoundedSemaphore(writers * 2)
+
+    def write(batch):
+        try:
+            count = write_batch(ctx, batch)
+            print(f"✅ Success for {batch['league']['name']} {batch['season']['name']} ({count} matches)")
+            return count
+        finally:
+            write_slots.release()
+
+    with ThreadPoolExecutor(max_workers=workers) as downloaders, \
+         ThreadPoolExecutor(max_workers=writers) as writer_pool:
+        downloads = {
+            downloaders.submit(download_league_season, ctx, season, league): (season, league)
+            for season, league in units
+        }
+        pending_writes = {}
+
+        for future in as_completed(downloads):
+            season, league = downloads[future]
+            try:
+                batch = future.result()
+            except Exception as e:
+                print(f"❌ Error processing {league['name']} {season['name']}: {e}")
+                ctx.mark(season, league, "failed", error=str(e))
+                continue
+            if not batch:
+                continue
+
+            print(f"📦 Downloaded {league['name']} {season['name']}. Queued for upsert...")
+            write_slots.acquire()
+            pending_writes[writer_pool.submit(write, batch)] = (season, league)
+
+        for future in as_completed(pending_writes):
+            season, league = pending_writes[future]
+            try:
+                count = future.result()
+                if count:
+                    total_matches += count
+                    total_seasons += 1
+            except Exception as e:
+                print(f"❌ Error upserting {league['name']} {season['name']}: {e}")
+                ctx.mark(season, league, "failed", error=str(e))
+
+    return total_matches, total_seasons
+
+def _pipeline_normalize(batch):
+    batch["rows"] = [normalize_match(m) for m in batch["rows"]]
+    if batch.get("features"):
+        batch["features"] = [normalize_match(f) for f in batch["features"]]
+    return batch
+
+def fetch_pipelined(workers=DEFAULT_WORKERS, parsers=DEFAULT_PARSERS, writers=DEFAULT_WRITERS,
+                    queue_size=DEFAULT_QUEUE_SIZE, use_cache=True, force=False,
+                    incremental=False, chunk_size=DEFAULT_CHUNK_SIZE, resume=False, only=None,
+                    local_store=True, sqlite=False, features=False, postgres=False):
+    """
+    Staged asyncio ingest: download -> parse/xG -> normalize -> upsert, each
+    stage with its own concurrency and a bounded queue in front of it. A slow
+    upsert no longer stalls the next download.
+    """
+    ctx, units = prepare_run(workers, use_cache, force, incremental, chunk_size, resume, only,
+                             local_store, sqlite, features, postgres)
+
+    def parse(batch):
+        """Parse stage: CSV lines -> match dicts with xG estimate (CPU work, off the event loop)"""
+        lines = batch.pop("lines")
+        if ctx.features:
+            batch["rows"], batch["features"] = extract_season(lines, batch["season"], batch["league"], parse_date)
+        else:
+            batch["rows"] = list(iter_matches(lines, batch["season"], batch["league"]))
+        return batch
+
+    def download(unit):
+        season, league = unit
+        raw = fetch_raw_csv(ctx, season, league)
+        if raw is None:
+            ctx.mark(season, league, "skipped")
+            return None
+        lines, sha256 = raw
+        return {"season": season, "league": league, "sha256": sha256, "lines": lines}
+
+    def upsert(batch):
+        count = write_batch(ctx, batch)
+        print(f"✅ Success for {batch['league']['name']} {batch['season']['name']} ({count} matches)")
+        return count
+
+    def unit_of(item):
+        return item if isinstance(item, tuple) else (item["season"], item["league"])
+
+    def describe(item):
+        season, league = unit_of(item)
+        return f"{league['name']} {season['name']}"
+
+    def on_error(item, error):
+        season, league = unit_of(item)
+        ctx.mark(season, league, "failed", error=str(error))
+
+    pipeline = IngestPipeline([
+        Stage("download", download, concurrency=workers, queue_size=queue_size),
+        Stage("parse", parse, concurrency=parsers, queue_size=queue_size),
+        Stage("normalize", _pipeline_normalize, concurrency=1, queue_size=queue_size),
+        Stage("upsert", upsert, concurrency=writers, queue_size=queue_size),
+    ], describe=describe, on_error=on_error)
+
+    counts = pipeline.run(units)
+    pipeline.print_report()
+    print_summary(ctx, sum(counts), sum(1 for c in counts if c))
+    ctx.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Import football-data.co.uk CSVs into Supabase")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Parallel league-season downloads (1 = serial)")
+    parser.add_argument("--writers", type=int, default=DEFAULT_WRITERS,
+                        help="Max concurrent upserts to Supabase")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Bypass the raw CSV cache in data/raw_csv")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-download and re-upsert even unchanged league-seasons")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Diff against existing rows and upsert only new/changed matches")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Initial rows per upsert request (adapts to errors)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Use the staged asyncio engine (download -> parse -> normalize -> upsert)")
+    parser.add_argument("--parsers", type=int, default=DEFAULT_PARSERS,
+                        help="Pipeline mode: concurrent parse workers")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Pipeline mode: bounded queue length in front of each stage")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip units already completed in data/ingest_manifest.json")
+    parser.add_argument("--only", action="append", metavar="LEAGUE:SEASON",
+                        help="Re-run only these units, e.g. --only SA:2425 (repeatable)")
+    parser.add_argument("--no-local-store", action="store_true",
+                        help="Do not write through to the local Parquet store (data/match_store)")
+    parser.add_argument("--sqlite", action="store_true",
+                        help="Also write through to the SQLite mirror (data/magotto.sqlite)")
+    parser.add_argument("--features", action="store_true",
+                        help="Vectorised (NumPy) parse that also fills match_features (cards, corners, odds...)")
+    parser.add_argument("--postgres", action="store_true",
+                        help="Write with COPY + merge over a direct connection (SUPABASE_DB_URL) instead of PostgREST")
+    args = parser.parse_args()
+
+    try:
+        only = [u for sel in args.only for u in sel.split(",")] if args.only else None
+        for sel in only or []:
+            parse_unit_selector(sel)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.pipeline:
+        fetch_pipelined(workers=max(args.workers, 1), parsers=max(args.parsers, 1),
+                        writers=max(args.writers, 1), queue_size=args.queue_size,
+                        use_cache=not args.no_cache, force=args.force,
+                        incremental=args.incremental, chunk_size=args.chunk_size,
+                        resume=args.resume, only=only, local_store=not args.no_local_store,
+                        sqlite=args.sqlite, features=args.features, postgres=args.postgres)
+    else:
+        fetch_and_insert(workers=args.workers, writers=max(args.writers, 1),
+                         use_cache=not args.no_cache, force=args.force,
+                         incremental=args.incremental, chunk_size=args.chunk_size,
+                         resume=args.resume, only=only, local_store=not args.no_local_store,
+                         sqlite=args.sqlite, features=args.features, postgres=args.postgres)
+
 if __name__ == "__main__":
-    fetch_and_insert()
+    main()
@@ -0,0 +1,286 @@
+"""
+HTTP CACHE - Cache su disco delle risposte HTTP dello scraper
+One entry per URL (sha256 of the URL) under data/scraped_news/http:
+`<key>.body` holds the raw response, `<key>.json` the URL, fetch time and
+validators (ETag / Last-Modified).
+
+  - fresh entry (younger than the TTL): served from disk, no request at all
+  - stale entry with validators: conditional GET (If-None-Match /
+    If-Modified-Since); a 304 only refreshes the timestamp
+  - network error with a stale entry on disk: the stale body is served
+  - eviction: entries older than `max_age` are deleted, then the oldest
+    ones until the directory is below `max_bytes`
+  - streaming (`stream`): the body is yielded in chunks while it is
+    written to disk; a reader that stops early (enough RSS items) closes
+    the connection and the prefix read so far is kept as a partial entry
+    (`complete: false`). A later reader that needs more than the prefix
+    asks for the rest with `Range: bytes=<size>-` + `If-Range: <validator>`
+    and splices it on only when the answer is a matching 206 (same
+    document version). Otherwise the stream ends at the prefix and the
+    partial entry is dropped, so versions are never mixed. `get` and the
+    stale-on-error fallback never serve partial entries.
+
+Thread-safe for concurrent fetches of different URLs (atomic file writes).
+"""
+
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class HttpCache:
+    def __init__(self, root: Path, ttl_seconds: float, max_age_seconds: float, max_bytes: int):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl_seconds
+        self.max_age = max_age_seconds
+        self.max_bytes = max_bytes
+        self.hits = self.revalidated = self.misses = 0
+        self._lock = threading.Lock()
+        self._total_bytes = self.evict()
+
+    # ---------- Paths / metadata ----------
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.root / f"{key}.body", self.root / f"{key}.json"
+
+    @staticmethod
+    def _read_meta(path: Path) -> dict | None:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _tmp_path(path: Path) -> Path:
+        return path.with_name(path.name + f".{threading.get_ident()}.tmp")
+
+    def _write_atomic(self, path: Path, data: bytes):
+        tmp = self._tmp_path(path)
+        tmp.write_bytes(data)
+        tmp.replace(path)
+
+    def _commit(self, url: str, body_tmp: Path, size: int, headers, complete: bool = True):
+        """Move a fully written body file in place and record its metadata"""
+        body_path, meta_path = self._paths(url)
+        meta = {
+            "url": url,
+            "fetched_at": time.time(),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "size": size,
+            "complete": complete,
+        }
+        previous = self._read_meta(meta_path)
+        body_tmp.replace(body_path)
+        self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+        with self._lock:
+            self._total_bytes += size - (previous or {}).get("size", 0)
+            over = self._total_bytes > self.max_bytes
+        if over:
+            self._total_bytes = self.evict()
+
+    def _store(self, url: str, response: requests.Response) -> bytes:
+        body = response.content
+        body_tmp = self._tmp_path(self._paths(url)[0])
+        body_tmp.write_bytes(body)
+        self._commit(url, body_tmp, len(body), response.headers)
+        return body
+
+    def _tee(self, url: str, response: requests.Response, chunk_size: int, prefix: Path | None = None,
+             headers=None):
+        """
+        Yield the body while writing it to disk (after the bytes of `prefix`,
+        for a 206 continuation); an early stop stores a partial entry
+        """
+        body_tmp = self._tmp_path(self._paths(url)[0])
+        size, complete = 0, False
+        try:
+            with open(body_tmp, "wb") as f:
+                if prefix is not None:
+                    for chunk in self._read_chunks(prefix, chunk_size):
+                        f.write(chunk)
+                        size += len(chunk)
+                for chunk in response.iter_content(chunk_size):
+                    f.write(chunk)
+                    size += len(chunk)
+                    yield chunk
+                complete = True
+        finally:
+            response.close()
+            if size:
+                self._commit(url, body_tmp, size, headers or response.headers, complete)
+            else:
+                body_tmp.unlink(missing_ok=True)
+
+    def _drop(self, url: str):
+        body_path, meta_path = self._paths(url)
+        meta = self._read_meta(meta_path)
+        meta_path.unlink(missing_ok=True)
+        body_path.unlink(missing_ok=True)
+        with self._lock:
+            self._total_bytes -= (meta or {}).get("size", 0)
+
+    @staticmethod
+    def _read_chunks(path: Path, chunk_size: int):
+        with open(path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+    def _touch(self, meta_path: Path, meta: dict):
+        meta["fetched_at"] = time.time()
+        self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+    # ---------- Public ----------
+
+    def get(self, session: requests.Session, url: str, timeout: float, before_request=None) -> bytes:
+        """
+        Response body for `url`, from disk when fresh. `before_request(url)`
+        runs only when a request is actually sent (rate limiting).
+        Raises like requests for network errors / non-2xx when nothing is cached.
+        """
+        body_path, meta_path = self._paths(url)
+        meta = self._read_meta(meta_path)
+        cached = meta is not None and body_path.exists() and meta.get("complete", True)
+
+        if cached and time.time() - meta["fetched_at"] < self.ttl:
+            self.hits += 1
+            return body_path.read_bytes()
+
+        headers = {}
+        if cached:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        if before_request:
+            before_request(url)
+        try:
+            response = session.get(url, timeout=timeout, headers=headers)
+            if cached and response.status_code == 304:
+                self.revalidated += 1
+                self._touch(meta_path, meta)
+                return body_path.read_bytes()
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            if cached:
+                logger.warning(f"Serving stale cache for {url}: {e}")
+                return body_path.read_bytes()
+            raise
+
+        self.misses += 1
+        return self._store(url, response)
+
+    def stream(self, session: requests.Session, url: str, timeout: float, before_request=None,
+               chunk_size: int = 16 * 1024):
+        """
+        Response body for `url` as chunks, with the same freshness /
+        revalidation / stale-on-error rules as `get`. Network bodies are
+        streamed and written to disk as they are read, so closing the
+        generator early stops the download (the prefix is cached).
+        """
+        body_path, meta_path = self._paths(url)
+        meta = self._read_meta(meta_path)
+        cached = meta is not None and body_path.exists()
+
+        if cached and time.time() - meta["fetched_at"] < self.ttl:
+            self.hits += 1
+            yield from self._serve(session, url, meta, timeout, before_request, chunk_size)
+            return
+
+        headers = {}
+        if cached:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        if before_request:
+            before_request(url)
+        try:
+            response = session.get(url, timeout=timeout, headers=headers, stream=True)
+            if cached and response.status_code == 304:
+                response.close()
+                self.revalidated += 1
+                self._touch(meta_path, meta)
+                yield from self._serve(session, url, meta, timeout, before_request, chunk_size)
+                return
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            if cached and meta.get("complete", True):
+                logger.warning(f"Serving stale cache for {url}: {e}")
+                yield from self._read_chunks(body_path, chunk_size)
+                return
+            raise
+
+        self.misses += 1
+        yield from self._tee(url, response, chunk_size)
+
+    def _serve(self, session, url: str, meta: dict, timeout: float, before_request, chunk_size: int):
+        """
+        A cached body. Past the end of a partial one the rest is requested
+        with Range + If-Range and appended only on a 206 starting at the
+        cached size; any other answer ends the stream at the prefix (one
+        consistent document version, fewer items) and drops the entry.
+        """
+        body_path = self._paths(url)[0]
+        yield from self._read_chunks(body_path, chunk_size)
+        if meta.get("complete", True):
+            return
+
+        etag = meta.get("etag")
+        validator = etag if etag and not etag.startswith("W/") else meta.get("last_modified")
+        if not validator:
+            logger.warning(f"Partial cache entry for {url} without validators; served the prefix only")
+            self._drop(url)
+            return
+
+        if before_request:
+            before_request(url)
+        size = meta["size"]
+        response = session.get(url, timeout=timeout, stream=True,
+                               headers={"Range": f"bytes={size}-", "If-Range": validator})
+        content_range = response.headers.get("Content-Range", "")
+        if response.status_code != 206 or not content_range.startswith(f"bytes {size}-"):
+            response.close()
+            logger.warning(f"{url} changed since it was partially cached; served the cached prefix only")
+            self._drop(url)
+            return
+        self.misses += 1
+        validators = {"ETag": response.headers.get("ETag") or etag,
+                      "Last-Modified": response.headers.get("Last-Modified") or meta.get("last_modified")}
+        yield from self._tee(url, response, chunk_size, prefix=body_path, headers=validators)
+
+    def evict(self) -> int:
+        """Drop expired entries, then the oldest until under max_bytes; returns the remaining size"""
+        now = time.time()
+        entries = []
+        for meta_path in self.root.glob("*.json"):
+            meta = self._read_meta(meta_path)
+            body_path = meta_path.with_suffix(".body")
+            if meta is None or not body_path.exists() or now - meta.get("fetched_at", 0) > self.max_age:
+                meta_path.unlink(missing_ok=True)
+                body_path.unlink(missing_ok=True)
+                continue
+            entries.append((meta["fetched_at"], meta.get("size", 0), meta_path, body_path))
+
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, meta_path, body_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            meta_path.unlink(missing_ok=True)
+            body_path.unlink(missing_ok=True)
+            total -= size
+        return total
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "revalidated": self.revalidated, "misses": self.misses}
@@ -0,0 +1,239 @@
+"""
+IMPORT FIXTURES - Import di risultati da file di testo in formato openfootball
+Streams any number of football.txt files (https://github.com/openfootball)
+line by line and upserts the played matches in batches:
+
+    = UEFA Champions League 2025/26
+    » League, Matchday 1
+      Tue Sep/16 2025
+        18.45  Athletic Club (ESP)     v Arsenal FC (ENG)         0-2 (0-0)
+               PSV (NED)               v Royale Union Saint-Gilloise (BEL)  1-3 (0-2)
+      [Wed Sep/17]
+        Arsenal FC  2-2 a.e.t. (1-1, 0-0)  Chelsea FC
+        Liverpool FC  v  Everton FC  3-5 pen. 1-1 a.e.t. (1-1, 0-1)
+
+- all line patterns are compiled once at import time;
+- team names go through team_resolver (hash index + one precompiled affix
+  alternation), so canonical names are written directly;
+- the stored score is the one after extra time (penalties excluded);
+  fixtures without a score are skipped;
+- dates without a year take it from the season (Jul-Dec first year,
+  Jan-Jun second year); the season comes from --season, the `= ... 2025/26`
+  title line or a `2025-26` directory in the path, in that order;
+- the league code comes from --league or the file name (cl.txt -> CL).
+
+Usage:
+    python execution/import_fixtures.py data/openfootball/2025-26/cl.txt
+    python execution/import_fixtures.py path/to/europe --dry-run
+    python execution/import_fixtures.py it.cup.txt --league CI --season 2024-2025 --postgres
+"""
+
+import os
+import re
+import sys
+from datetime import date
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from match_store import open_existing_store
+from pg_writer import open_pg_writer
+from team_resolver import resolve_team
+
+BATCH_SIZE = 500
+
+# File name (openfootball europe repo) -> league code
+LEAGUE_BY_FILE = {
+    "cl": "CL",
+    "el": "EL",
+    "conf": "ECL",
+    "uefa.cl": "CL",
+    "uefa.el": "EL",
+    "uefa.conf": "ECL",
+}
+
+MONTHS = {m: i for i, m in enumerate(
+    ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1)}
+
+_TITLE = re.compile(r"^=\s*(?P<name>.*?)\s+(?P<start>\d{4})(?:/\d{2,4})?\s*$")
+_PATH_SEASON = re.compile(r"^(?P<start>\d{4})-(?:\d{2}|\d{4})$")
+_DATE = re.compile(
+    r"^\[?(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)\.?\s+"
+    r"(?P<month>Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)/(?P<day>\d{1,2})"
+    r"(?:\s+(?P<year>\d{4}))?\]?"
+)
+_TIME = r"(?:\d{1,2}[.:]\d{2}\s+)?"
+_SCORE = r"(?P<hg>\d+)-(?P<ag>\d+)"
+_AET = re.compile(r"(?P<hg>\d+)-(?P<ag>\d+)\s+a\.e\.t\.")
+# "Home v Away 1-0 ..." (current openfootball layout)
+_GAME_V = re.compile(rf"^{_TIME}(?P<home>.+?)\s+v\s+(?P<away>.+?)\s+(?P<result>\d+-\d+.*)$")
+# "Home 1-0 (0-0) Away" (older layout, score between the teams)
+_GAME_MID = re.compile(
+    rf"^{_TIME}(?P<home>.+?)\s+(?P<result>(?:\d+-\d+\s+pen\.\s+)?\d+-\d+(?:\s+a\.e\.t\.)?(?:\s+\([\d\-,\s]+\))?)\s+"
+    r"(?P<away>\D.*?)\s*$"
+)
+_FIRST_SCORE = re.compile(_SCORE)
+_PENALTIES = re.compile(r"^\d+-\d+\s+pen\.\s+")
+
+
+def season_from_start(start: str) -> str:
+    """'2025' (from 2025/26 or 2025-26) -> '2025-2026'"""
+    return f"{int(start)}-{int(start) + 1}"
+
+
+def season_from_path(path: Path) -> str | None:
+    for part in reversed(path.parts[:-1]):
+        match = _PATH_SEASON.match(part)
+        if match:
+            return season_from_start(match["start"])
+    return None
+
+
+def league_from_path(path: Path) -> str | None:
+    name = path.name.removesuffix(".txt")
+    return LEAGUE_BY_FILE.get(name) or LEAGUE_BY_FILE.get(name.split(".")[-1])
+
+
+def parse_result(result: str) -> tuple[int, int]:
+    """Goals after extra time: '3-5 pen. 1-1 a.e.t. (1-1, 0-1)' -> (1, 1)"""
+    result = _PENALTIES.sub("", result)
+    score = _AET.search(result) or _FIRST_SCORE.match(result)
+    return int(score["hg"]), int(score["ag"])
+
+
+def parse_lines(lines, league: str, season: str | None = None):
+    """Yield match rows from football.txt lines (one pass, constant memory)"""
+    start_year = int(season[:4]) if season else None
+    current_date = None
+    for raw in lines:
+        line = raw.strip()
+        if not line or line.startswith(("#", "»", "▪")):
+            continue
+
+        if line.startswith("="):
+            title = _TITLE.match(line)
+            if title and not season:
+                season = season_from_start(title["start"])
+                start_year = int(title["start"])
+            continue
+
+        date_match = _DATE.match(line)
+        if date_match:
+            month = MONTHS[date_match["month"]]
+            if date_match["year"]:
+                year = int(date_match["year"])
+            elif start_year is not None:
+                year = start_year if month >= 7 else start_year + 1
+            else:
+                raise ValueError(f"Date without year and no season: {line!r} (use --season)")
+            current_date = date(year, month, int(date_match["day"])).isoformat()
+            # Some files put the first fixture on the date line
+            line = line[date_match.end():].strip()
+            if not line:
+                continue
+
+        game = _GAME_V.match(line) or _GAME_MID.match(line)
+        if not game or current_date is None:
+            continue
+        home_goals, away_goals = parse_result(game["result"])
+        yield {
+            "date": current_date,
+            "home_team": resolve_team(game["home"]),
+            "away_team": resolve_team(game["away"]),
+            "home_goals": home_goals,
+            "away_goals": away_goals,
+            "league": league,
+            "season": season,
+        }
+
+
+def iter_files(paths):
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(path.rglob("*.txt"))
+        else:
+            yield path
+
+
+def iter_matches(paths, league: str | None = None, season: str | None = None):
+    for path in iter_files(paths):
+        file_league = league or league_from_path(path)
+        if not file_league:
+            print(f"⚠️ {path}: unknown competition, skipped (use --league)")
+            continue
+        with open(path, encoding="utf-8") as f:
+            yield from parse_lines(f, file_league, season or season_from_path(path))
+
+
+def batched(rows, size: int = BATCH_SIZE):
+    """Lists of up to `size` rows, deduplicated on the upsert key (last one wins)"""
+    batch: dict[tuple, dict] = {}
+    for row in rows:
+        batch[(row["date"], row["home_team"], row["away_team"])] = row
+        if len(batch) >= size:
+            yield list(batch.values())
+            batch = {}
+    if batch:
+        yield list(batch.values())
+
+
+def import_files(paths, league: str | None = None, season: str | None = None,
+                 postgres: bool = False, dry_run: bool = False) -> int:
+    rows = iter_matches(paths, league, season)
+    if dry_run:
+        total = 0
+        for row in rows:
+            total += 1
+            print(f"   {row['date']} [{row['league']} {row['season']}] "
+                  f"{row['home_team']} {row['home_goals']}-{row['away_goals']} {row['away_team']}")
+        print(f"📊 {total} partite (dry-run, niente scritto)")
+        return total
+
+    # Write through to the local Parquet store (if built), like the ingest
+    store = open_existing_store()
+    if postgres:
+        # COPY + merge over a direct connection (SUPABASE_DB_URL)
+        writer = open_pg_writer()
+        if writer is None:
+            sys.exit(1)
+        total = 0
+        with writer:
+            for batch in batched(rows):
+                total += writer.upsert("matches", batch)
+                if store:
+                    store.upsert(batch)
+    else:
+        from supabase import create_client
+        load_dotenv()
+        url, key = os.getenv("VITE_SUPABASE_URL"), os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+        if not url or not key:
+            print("❌ Missing Supabase credentials")
+            sys.exit(1)
+        supabase = create_client(url, key)
+        total = 0
+        for batch in batched(rows):
+            supabase.table("matches").upsert(batch, on_conflict="date,home_team,away_team").execute()
+            if store:
+                store.upsert(batch)
+            total += len(batch)
+    print(f"✅ Importate {total} partite")
+    return total
+
+
+def main(argv=None, default_paths=None, default_league=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import risultati da file openfootball (football.txt)")
+    parser.add_argument("paths", nargs="*" if default_paths else "+", default=default_paths,
+                        help="File .txt o cartelle (ricerca ricorsiva)")
+    parser.add_argument("--league", default=default_league, help="Codice campionato (default: dal nome file, cl.txt -> CL)")
+    parser.add_argument("--season", help="Stagione, es. 2025-2026 (default: titolo del file o cartella 2025-26)")
+    parser.add_argument("--dry-run", action="store_true", help="Stampa le partite senza scrivere")
+    parser.add_argument("--postgres", action="store_true",
+                        help="Write with COPY + merge over a direct connection (SUPABASE_DB_URL) instead of PostgREST")
+    args = parser.parse_args(argv)
+    import_files(args.paths, args.league, args.season, postgres=args.postgres, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
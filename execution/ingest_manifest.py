@@ -0,0 +1,77 @@
+"""
+INGEST MANIFEST - Stato su disco di un run di ingest
+Records, for every league-season unit ("SA:2425"), its status, row count
+and content hash, so an interrupted run can resume from the first
+incomplete unit instead of re-crawling everything.
+
+Statuses: pending, done, skipped (unchanged / not published), failed.
+"""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+
+MANIFEST_PATH = Path(__file__).parent.parent / "data" / "ingest_manifest.json"
+COMPLETE_STATUSES = {"done", "skipped"}
+
+
+def unit_key(league_code: str, season_code: str) -> str:
+    return f"{league_code}:{season_code}"
+
+
+class IngestManifest:
+    """Thread-safe manifest, rewritten atomically after every status change"""
+
+    def __init__(self, path: Path = MANIFEST_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.data = {"started_at": None, "units": {}}
+
+    def load(self) -> bool:
+        try:
+            self.data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.data.setdefault("units", {})
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def start(self, keys: list[str], resume: bool = False, keep_others: bool = False):
+        """
+        Begin a run over `keys`. A fresh run resets the manifest; with `resume`
+        completed units keep their status. `keep_others` preserves entries for
+        units outside this run (used by --only).
+        """
+        loaded = self.load() if (resume or keep_others) else False
+        units = self.data["units"] if loaded else {}
+        if not keep_others:
+            units = {k: v for k, v in units.items() if k in keys}
+        for key in keys:
+            entry = units.get(key)
+            if not resume or not entry or entry.get("status") not in COMPLETE_STATUSES:
+                units[key] = {"status": "pending"}
+        self.data = {"started_at": datetime.now().isoformat(), "units": units}
+        self._save()
+
+    def is_complete(self, key: str) -> bool:
+        return self.data["units"].get(key, {}).get("status") in COMPLETE_STATUSES
+
+    def mark(self, key: str, status: str, rows: int = 0, sha256: str | None = None, error: str | None = None):
+        entry = {"status": status, "rows": rows, "sha256": sha256, "updated_at": datetime.now().isoformat()}
+        if error:
+            entry["error"] = error
+        with self._lock:
+            self.data["units"][key] = entry
+            self._save()
+
+    def summary(self) -> dict:
+        counts = {}
+        for entry in self.data["units"].values():
+            counts[entry.get("status", "pending")] = counts.get(entry.get("status", "pending"), 0) + 1
+        return counts
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(self.data, indent=2), encoding="utf-8")
+        tmp.replace(self.path)
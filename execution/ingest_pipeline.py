@@ -0,0 +1,141 @@
+"""
+INGEST PIPELINE - Motore asyncio a stadi per l'ingest
+Runs a chain of blocking stage functions (download, parse, normalize,
+upsert, ...) connected by bounded asyncio queues. Each stage has its own
+concurrency limit and runs on a dedicated thread pool, so network I/O,
+CPU parsing and database writes overlap instead of blocking each other.
+
+Queue depths are sampled while the pipeline runs: a queue that stays full
+points at a slow downstream stage, an empty one at a slow upstream stage.
+"""
+
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+SAMPLE_INTERVAL_SECONDS = 0.25
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """A pipeline step. `func(item)` returns the item for the next stage, or None to drop it."""
+    name: str
+    func: Callable[[Any], Any]
+    concurrency: int = 1
+    queue_size: int = 4
+
+
+@dataclass
+class StageStats:
+    name: str
+    processed: int = 0
+    dropped: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    depth_samples: list[int] = field(default_factory=list)
+
+    @property
+    def avg_depth(self) -> float:
+        return sum(self.depth_samples) / len(self.depth_samples) if self.depth_samples else 0.0
+
+    @property
+    def max_depth(self) -> int:
+        return max(self.depth_samples, default=0)
+
+
+class IngestPipeline:
+    def __init__(self, stages: list[Stage], describe: Callable[[Any], str] = str,
+                 on_error: Callable[[Any, Exception], None] | None = None):
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        self.stages = stages
+        self.describe = describe
+        self.on_error = on_error
+        self.stats = [StageStats(stage.name) for stage in stages]
+        self.results: list[Any] = []
+
+    def run(self, items: Iterable[Any]) -> list[Any]:
+        """Feed `items` through every stage and return the outputs of the last one"""
+        asyncio.run(self._run(list(items)))
+        return self.results
+
+    async def _run(self, items: list[Any]):
+        loop = asyncio.get_running_loop()
+        queues = [asyncio.Queue(maxsize=max(stage.queue_size, 1)) for stage in self.stages]
+        total_workers = sum(max(stage.concurrency, 1) for stage in self.stages)
+
+        with ThreadPoolExecutor(max_workers=total_workers) as executor:
+            monitor = asyncio.create_task(self._sample_depths(queues))
+            feeder = asyncio.create_task(self._feed(items, queues[0], max(self.stages[0].concurrency, 1)))
+
+            stage_tasks = []
+            for index, stage in enumerate(self.stages):
+                workers = [
+                    asyncio.create_task(self._worker(loop, executor, index, queues))
+                    for _ in range(max(stage.concurrency, 1))
+                ]
+                stage_tasks.append(workers)
+
+            await feeder
+            for index, workers in enumerate(stage_tasks):
+                await asyncio.gather(*workers)
+                # Upstream stage drained: release every worker of the next stage
+                if index + 1 < len(self.stages):
+                    for _ in range(max(self.stages[index + 1].concurrency, 1)):
+                        await queues[index + 1].put(_DONE)
+
+            monitor.cancel()
+
+    async def _feed(self, items, queue, consumers):
+        for item in items:
+            await queue.put(item)
+        for _ in range(consumers):
+            await queue.put(_DONE)
+
+    async def _worker(self, loop, executor, index, queues):
+        stage = self.stages[index]
+        stats = self.stats[index]
+        inbox = queues[index]
+        outbox = queues[index + 1] if index + 1 < len(queues) else None
+
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                return
+
+            started = time.perf_counter()
+            try:
+                result = await loop.run_in_executor(executor, stage.func, item)
+            except Exception as e:
+                stats.failed += 1
+                print(f"❌ [{stage.name}] {self.describe(item)}: {e}")
+                if self.on_error:
+                    self.on_error(item, e)
+                continue
+            finally:
+                stats.busy_seconds += time.perf_counter() - started
+
+            if result is None:
+                stats.dropped += 1
+                continue
+
+            stats.processed += 1
+            if outbox is None:
+                self.results.append(result)
+            else:
+                await outbox.put(result)
+
+    async def _sample_depths(self, queues):
+        while True:
+            for stats, queue in zip(self.stats, queues):
+                stats.depth_samples.append(queue.qsize())
+            await asyncio.sleep(SAMPLE_INTERVAL_SECONDS)
+
+    def print_report(self):
+        print(f"\n{'Stage':<12} {'ok':>5} {'skip':>5} {'fail':>5} {'busy s':>8} {'queue avg':>10} {'queue max':>10}")
+        for stage, stats in zip(self.stages, self.stats):
+            print(f"{stats.name:<12} {stats.processed:>5} {stats.dropped:>5} {stats.failed:>5} "
+                  f"{stats.busy_seconds:>8.2f} {stats.avg_depth:>10.2f} {stats.max_depth:>6}/{stage.queue_size:<3}")
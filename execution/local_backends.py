@@ -0,0 +1,19 @@
+"""
+LOCAL BACKENDS - Selezione della sorgente dati per gli script di verifica/pulizia
+`supabase` (default) reads the hosted tables; `parquet` (data/match_store)
+and `sqlite` (data/magotto.sqlite) read the local mirrors, which expose the
+same `rows(league=, season=, team=, date_from=, date_to=, columns=)` API.
+"""
+
+BACKEND_CHOICES = ["supabase", "parquet", "sqlite"]
+
+
+def open_local_backend(name: str):
+    # Imported lazily so pyarrow stays optional for sqlite-only users
+    if name == "parquet":
+        from match_store import MatchStore
+        return MatchStore()
+    if name == "sqlite":
+        from sqlite_mirror import SqliteMirror
+        return SqliteMirror()
+    raise ValueError(f"Not a local backend: {name}")
@@ -0,0 +1,258 @@
+"""
+MATCH STORE - Snapshot colonnare locale della tabella `matches`
+Mirrors Supabase `matches` into Parquet files under data/match_store,
+hive-partitioned by league and season:
+
+    data/match_store/league=SA/season=2024-2025/part-0.parquet
+
+Queries prune partitions and columns and push date/team predicates down
+to the Parquet reader, so analytics and validation run locally instead of
+paging through PostgREST 1000 rows at a time. The ingest and
+import_fixtures.py write through to the store after each successful
+upsert; sync_teams.py, db_cleanup.py and dedup_fixtures.py rebuild it
+after renaming or deleting rows (refresh_local_store); `--sync` rebuilds
+it from Supabase by hand.
+
+Usage:
+    python execution/match_store.py --sync
+    python execution/match_store.py --stats
+    python execution/match_store.py --league SA --season 2024-2025 --team Inter
+"""
+
+import os
+import sys
+import logging
+import threading
+from datetime import date
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from table_reader import DEFAULT_WORKERS, iter_table
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Optional dependency: the store is disabled when pyarrow is missing
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+    logger.warning("pyarrow not installed. Local match store disabled (pip install pyarrow).")
+
+STORE_DIR = Path(__file__).parent.parent / "data" / "match_store"
+
+if ARROW_AVAILABLE:
+    # league/season live in the partition path, not in the files
+    FILE_SCHEMA = pa.schema([
+        ("id", pa.int64()),
+        ("date", pa.date32()),
+        ("home_team", pa.string()),
+        ("away_team", pa.string()),
+        ("home_goals", pa.int32()),
+        ("away_goals", pa.int32()),
+        ("home_xg", pa.float64()),
+        ("away_xg", pa.float64()),
+    ])
+    PARTITIONING = ds.partitioning(
+        pa.schema([("league", pa.string()), ("season", pa.string())]), flavor="hive"
+    )
+
+
+def _as_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def _key(row: dict) -> tuple:
+    return (_as_date(row["date"]), row["home_team"], row["away_team"])
+
+
+class MatchStore:
+    """Partitioned Parquet mirror of `matches` with a small filter/projection query API"""
+
+    def __init__(self, root: Path = STORE_DIR):
+        if not ARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required for the local match store")
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def _partition_path(self, league: str, season: str) -> Path:
+        return self.root / f"league={league}" / f"season={season}" / "part-0.parquet"
+
+    def exists(self) -> bool:
+        return self.root.is_dir() and any(self.root.glob("league=*/season=*/*.parquet"))
+
+    # ---------- Writes ----------
+
+    def upsert(self, rows: list[dict]) -> int:
+        """Merge rows into their league-season partitions by (date, home_team, away_team)"""
+        by_partition: dict[tuple, list[dict]] = {}
+        for row in rows:
+            by_partition.setdefault((row["league"], row["season"]), []).append(row)
+
+        with self._lock:
+            for (league, season), part_rows in by_partition.items():
+                path = self._partition_path(league, season)
+                merged = {}
+                if path.exists():
+                    for existing in pq.read_table(path, schema=FILE_SCHEMA).to_pylist():
+                        merged[_key(existing)] = existing
+                for row in part_rows:
+                    key = _key(row)
+                    previous = merged.get(key, {})
+                    merged[key] = {
+                        "id": row.get("id", previous.get("id")),
+                        "date": key[0],
+                        "home_team": row["home_team"],
+                        "away_team": row["away_team"],
+                        "home_goals": row["home_goals"],
+                        "away_goals": row["away_goals"],
+                        "home_xg": float(row.get("home_xg") or 0),
+                        "away_xg": float(row.get("away_xg") or 0),
+                    }
+                self._write_partition(path, sorted(merged.values(), key=lambda r: (r["date"], r["home_team"])))
+        return len(rows)
+
+    def replace_all(self, rows: list[dict]):
+        """Rebuild the store from a full snapshot"""
+        with self._lock:
+            for old in self.root.glob("league=*/season=*/*.parquet"):
+                old.unlink()
+        self.upsert(rows)
+
+    @staticmethod
+    def _write_partition(path: Path, rows: list[dict]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        pq.write_table(pa.Table.from_pylist(rows, schema=FILE_SCHEMA), tmp)
+        tmp.replace(path)
+
+    # ---------- Reads ----------
+
+    def query(self, league=None, season=None, team=None, date_from=None, date_to=None,
+              columns=None) -> "pa.Table":
+        """
+        Filter by league/season (partition pruning), team (home or away) and
+        an inclusive date range; `columns` limits what is read from disk.
+        """
+        if not self.exists():
+            return pa.table({})
+        dataset = ds.dataset(self.root, format="parquet", partitioning=PARTITIONING)
+
+        conditions = []
+        if league:
+            conditions.append(ds.field("league") == league)
+        if season:
+            conditions.append(ds.field("season") == season)
+        if team:
+            conditions.append((ds.field("home_team") == team) | (ds.field("away_team") == team))
+        if date_from:
+            conditions.append(ds.field("date") >= pa.scalar(_as_date(date_from), pa.date32()))
+        if date_to:
+            conditions.append(ds.field("date") <= pa.scalar(_as_date(date_to), pa.date32()))
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        return dataset.to_table(columns=list(columns) if columns else None, filter=expression)
+
+    def rows(self, **filters) -> list[dict]:
+        """Same filters as query(), returned as dicts with ISO date strings (PostgREST shape)"""
+        rows = self.query(**filters).to_pylist()
+        for row in rows:
+            if isinstance(row.get("date"), date):
+                row["date"] = row["date"].isoformat()
+        return rows
+
+    def stats(self) -> dict:
+        partitions = list(self.root.glob("league=*/season=*/*.parquet"))
+        rows = sum(pq.ParquetFile(path).metadata.num_rows for path in partitions)
+        return {"rows": rows, "partitions": len(partitions)}
+
+    # ---------- Sync ----------
+
+    def sync_from_supabase(self, client) -> int:
+        """Full refresh from the `matches` table"""
+        rows = iter_table(client, 'matches',
+                          'id, date, home_team, away_team, home_goals, away_goals, home_xg, away_xg, league, season',
+                          workers=DEFAULT_WORKERS)
+        all_rows = [r for r in rows if r.get("league") and r.get("season")]
+
+        self.replace_all(all_rows)
+        logger.info(f"Local store rebuilt: {len(all_rows)} matches")
+        return len(all_rows)
+
+
+def open_store() -> "MatchStore | None":
+    """The store if pyarrow is available, else None (callers fall back to Supabase)"""
+    return MatchStore() if ARROW_AVAILABLE else None
+
+
+def open_existing_store() -> "MatchStore | None":
+    """The store only if it has been built, for scripts that keep it in step but never create it"""
+    store = open_store()
+    return store if store is not None and store.exists() else None
+
+
+def refresh_local_store(client, reason: str) -> int | None:
+    """
+    Rebuild the store after a script changed `matches` outside the ingest
+    write-through (renames, deletes). Nothing to do when the store was
+    never built; on failure the manual command is printed.
+    """
+    store = open_existing_store()
+    if store is None:
+        return None
+    try:
+        count = store.sync_from_supabase(client)
+    except Exception as e:
+        print(f"⚠️ Local match store not refreshed after {reason} ({e}): run python execution/match_store.py --sync")
+        return None
+    print(f"🔄 Local match store refreshed after {reason} ({count} matches)")
+    return count
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="MAGOTTO local match store")
+    parser.add_argument("--sync", action="store_true", help="Rebuild the store from Supabase")
+    parser.add_argument("--stats", action="store_true", help="Print row/partition counts")
+    parser.add_argument("--league", type=str)
+    parser.add_argument("--season", type=str)
+    parser.add_argument("--team", type=str)
+    parser.add_argument("--from", dest="date_from", type=str)
+    parser.add_argument("--to", dest="date_to", type=str)
+    args = parser.parse_args()
+
+    if not ARROW_AVAILABLE:
+        sys.exit(1)
+
+    store = MatchStore()
+
+    if args.sync:
+        load_dotenv()
+        from supabase import create_client
+        url = os.getenv("VITE_SUPABASE_URL")
+        key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("VITE_SUPABASE_ANON_KEY")
+        if not url or not key:
+            logger.error("Supabase credentials not found. Check your .env file.")
+            sys.exit(1)
+        store.sync_from_supabase(create_client(url, key))
+
+    if args.stats:
+        print(store.stats())
+
+    if args.league or args.season or args.team or args.date_from or args.date_to:
+        for row in store.rows(league=args.league, season=args.season, team=args.team,
+                              date_from=args.date_from, date_to=args.date_to):
+            print(f"{row['date']}  {row['home_team']:>20} {row['home_goals']}-{row['away_goals']} "
+                  f"{row['away_team']:<20} ({row['league']} {row['season']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+MATCH VALIDATOR - Controlli di qualità strutturali sulla tabella `matches`
+Streams the whole table once (keyset pages, see table_reader.py) into
+columnar NumPy arrays with team/league/season names encoded as integers,
+then evaluates every invariant with vectorised group-bys (np.unique on
+packed integer keys):
+
+  alias_duplicate      same fixture stored under two spellings
+                       (date + canonical home/away via team_resolver)
+  team_same_date       a team with more than one distinct fixture on a date
+  self_match           home team == away team
+  impossible_score     negative or implausibly high goals, negative xG
+  missing_score        played date but NULL goals
+  zero_xg              both xG 0 or NULL (report per league-season)
+  round_robin          domestic league-season whose ordered pairings are
+                       not exactly one each (n teams -> n*(n-1) fixtures)
+
+The report is JSON (`--output report.json`, or `--json` on stdout). Exit
+status is 1 when any check of severity "error" fails, so the validator
+can run after every ingest. Requires numpy.
+
+Usage:
+    python execution/match_validator.py
+    python execution/match_validator.py --backend sqlite --output .tmp/match_report.json
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+from datetime import date, datetime
+
+from dotenv import load_dotenv
+
+from local_backends import BACKEND_CHOICES, open_local_backend
+from season_roster import CURRENT_SEASON
+from table_reader import DEFAULT_WORKERS, iter_table
+from team_resolver import resolve_team
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logger.warning("numpy not installed. Match validator disabled (pip install numpy).")
+
+COLUMNS = ["id", "date", "home_team", "away_team", "home_goals", "away_goals",
+           "home_xg", "away_xg", "league", "season"]
+
+# Leagues ingested from football-data.co.uk: plain double round-robin
+ROUND_ROBIN_LEAGUES = ("PL", "SA", "LL", "BL", "L1")
+MAX_GOALS = 15
+MAX_XG = 10.0
+MISSING = -1
+
+SEVERITY = {
+    "alias_duplicate": "error",
+    "team_same_date": "error",
+    "self_match": "error",
+    "impossible_score": "error",
+    "missing_score": "warning",
+    "zero_xg": "warning",
+    "round_robin": "warning",
+}
+
+
+class _Codes:
+    """String -> dense int code, in first-seen order"""
+
+    def __init__(self):
+        self.codes: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def __call__(self, value) -> int:
+        if value is None:
+            return MISSING
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class MatchColumns:
+    """The whole table as parallel arrays; names as int codes"""
+
+    def __init__(self, rows):
+        self.teams, self.canonical, self.leagues, self.seasons = _Codes(), _Codes(), _Codes(), _Codes()
+        canonical_of: dict[int, int] = {}
+        ids, days, home, away, league, season = [], [], [], [], [], []
+        goals, xg = [], []
+        for row in rows:
+            ids.append(row["id"] if row.get("id") is not None else MISSING)
+            days.append(date.fromisoformat(str(row["date"])[:10]).toordinal() if row.get("date") else 0)
+            for team, out in ((row["home_team"], home), (row["away_team"], away)):
+                code = self.teams(team)
+                out.append(code)
+                if code not in canonical_of:
+                    canonical_of[code] = self.canonical(resolve_team(team))
+            league.append(self.leagues(row.get("league")))
+            season.append(self.seasons(row.get("season")))
+            goals.append((_num(row.get("home_goals")), _num(row.get("away_goals"))))
+            xg.append((_num(row.get("home_xg")), _num(row.get("away_xg"))))
+
+        self.id = np.array(ids, dtype=np.int64)
+        self.day = np.array(days, dtype=np.int64)
+        self.home = np.array(home, dtype=np.int64)
+        self.away = np.array(away, dtype=np.int64)
+        self.league = np.array(league, dtype=np.int64)
+        self.season = np.array(season, dtype=np.int64)
+        goals = np.array(goals, dtype=np.float64).reshape(-1, 2)
+        xg = np.array(xg, dtype=np.float64).reshape(-1, 2)
+        self.home_goals, self.away_goals = goals[:, 0], goals[:, 1]
+        self.home_xg, self.away_xg = xg[:, 0], xg[:, 1]
+
+        to_canonical = np.array([canonical_of[i] for i in range(len(self.teams.values))], dtype=np.int64)
+        self.home_canonical = to_canonical[self.home] if len(self.home) else self.home
+        self.away_canonical = to_canonical[self.away] if len(self.away) else self.away
+
+    def __len__(self):
+        return len(self.id)
+
+    def describe(self, i: int) -> dict:
+        return {
+            "id": int(self.id[i]),
+            "date": date.fromordinal(int(self.day[i])).isoformat() if self.day[i] else None,
+            "home_team": self.teams.values[self.home[i]],
+            "away_team": self.teams.values[self.away[i]],
+            "league": _decode(self.leagues, self.league[i]),
+            "season": _decode(self.seasons, self.season[i]),
+        }
+
+
+def _num(value) -> float:
+    return float("nan") if value is None else float(value)
+
+
+def _decode(codes: _Codes, code) -> str | None:
+    return None if code == MISSING else codes.values[code]
+
+
+def _pack(*columns) -> "np.ndarray":
+    """Combine non-negative int columns into one int64 key (mixed radix)"""
+    key = np.zeros(len(columns[0]), dtype=np.int64)
+    for column in columns:
+        key = key * (int(column.max(initial=0)) + 2) + (column + 1)
+    return key
+
+
+def _groups(key) -> tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """(order, group starts, group sizes) of rows sorted by key"""
+    order = np.argsort(key, kind="stable")
+    _, starts, counts = np.unique(key[order], return_index=True, return_counts=True)
+    return order, starts, counts
+
+
+# ---------- Checks ----------
+
+def check_alias_duplicates(m: MatchColumns) -> list[dict]:
+    order, starts, counts = _groups(_pack(m.day, m.home_canonical, m.away_canonical))
+    return [
+        {"fixture": [m.describe(i) for i in order[start:start + count]]}
+        for start, count in zip(starts[counts > 1], counts[counts > 1])
+    ]
+
+
+def check_team_same_date(m: MatchColumns) -> list[dict]:
+    # One row per (team, fixture); fixtures already reported as alias duplicates count once
+    fixture_key = _pack(m.day, m.home_canonical, m.away_canonical)
+    _, first = np.unique(fixture_key, return_index=True)
+    rows = np.sort(first)
+    teams = np.concatenate([m.home_canonical[rows], m.away_canonical[rows]])
+    days = np.concatenate([m.day[rows], m.day[rows]])
+    row_of = np.concatenate([rows, rows])
+    dated = days > 0
+    teams, days, row_of = teams[dated], days[dated], row_of[dated]
+
+    order, starts, counts = _groups(_pack(teams, days))
+    return [
+        {
+            "team": m.canonical.values[teams[order[start]]],
+            "date": date.fromordinal(int(days[order[start]])).isoformat(),
+            "matches": [m.describe(i) for i in row_of[order[start:start + count]]],
+        }
+        for start, count in zip(starts[counts > 1], counts[counts > 1])
+    ]
+
+
+def check_self_matches(m: MatchColumns) -> list[dict]:
+    return [m.describe(i) for i in np.flatnonzero(m.home_canonical == m.away_canonical)]
+
+
+def check_impossible_scores(m: MatchColumns) -> list[dict]:
+    goals = np.stack([m.home_goals, m.away_goals])
+    xg = np.stack([m.home_xg, m.away_xg])
+    fractional = ~np.isnan(goals) & (goals != np.floor(goals))
+    bad = ((goals < 0) | (goals > MAX_GOALS) | fractional).any(axis=0) \
+        | ((xg < 0) | (xg > MAX_XG)).any(axis=0)
+    return [
+        {**m.describe(i), "score": [_plain(m.home_goals[i]), _plain(m.away_goals[i])],
+         "xg": [_plain(m.home_xg[i]), _plain(m.away_xg[i])]}
+        for i in np.flatnonzero(bad)
+    ]
+
+
+def check_missing_scores(m: MatchColumns, today: int) -> list[dict]:
+    played = (m.day > 0) & (m.day < today)
+    missing = np.isnan(m.home_goals) | np.isnan(m.away_goals)
+    return [m.describe(i) for i in np.flatnonzero(played & missing)]
+
+
+def check_zero_xg(m: MatchColumns) -> list[dict]:
+    zero = (np.nan_to_num(m.home_xg) == 0) & (np.nan_to_num(m.away_xg) == 0)
+    order, starts, counts = _groups(_pack(m.league, m.season))
+    zero_per_group = np.add.reduceat(zero[order].astype(np.int64), starts) if len(order) else starts
+    return [
+        {
+            "league": _decode(m.leagues, m.league[order[start]]),
+            "season": _decode(m.seasons, m.season[order[start]]),
+            "matches": int(count),
+            "zero_xg": int(zeros),
+            "ids": [int(i) for i in np.sort(m.id[order[start:start + count]][zero[order[start:start + count]]])],
+        }
+        for start, count, zeros in zip(starts, counts, zero_per_group)
+        if zeros
+    ]
+
+
+def check_round_robin(m: MatchColumns) -> list[dict]:
+    issues = []
+    domestic = np.isin(m.league, [m.leagues.codes[c] for c in ROUND_ROBIN_LEAGUES if c in m.leagues.codes])
+    rows = np.flatnonzero(domestic & (m.season != MISSING))
+    if not len(rows):
+        return issues
+    order, starts, counts = _groups(_pack(m.league[rows], m.season[rows]))
+    for start, count in zip(starts, counts):
+        group = rows[order[start:start + count]]
+        home, away = m.home_canonical[group], m.away_canonical[group]
+        teams = np.unique(np.concatenate([home, away]))
+        n = len(teams)
+        pairs, pair_counts = np.unique(home * (len(m.canonical.values) + 1) + away, return_counts=True)
+        expected = n * (n - 1)
+        repeated = int((pair_counts > 1).sum())
+        if len(pairs) == expected and not repeated:
+            continue
+        season = _decode(m.seasons, m.season[group[0]])
+        issues.append({
+            "league": _decode(m.leagues, m.league[group[0]]),
+            "season": season,
+            "teams": n,
+            "fixtures": int(count),
+            "expected_fixtures": expected,
+            "missing_pairings": expected - len(pairs),
+            "repeated_pairings": repeated,
+            "in_progress": season == CURRENT_SEASON,
+        })
+    return issues
+
+
+def _plain(value):
+    return None if np.isnan(value) else float(value)
+
+
+# ---------- Engine ----------
+
+def validate(rows, today: date | None = None) -> dict:
+    started = time.perf_counter()
+    m = MatchColumns(rows)
+    loaded = time.perf_counter()
+
+    today_ordinal = (today or date.today()).toordinal()
+    results = {
+        "alias_duplicate": check_alias_duplicates(m),
+        "team_same_date": check_team_same_date(m),
+        "self_match": check_self_matches(m),
+        "impossible_score": check_impossible_scores(m),
+        "missing_score": check_missing_scores(m, today_ordinal),
+        "zero_xg": check_zero_xg(m),
+        "round_robin": check_round_robin(m),
+    }
+    finished = time.perf_counter()
+
+    checks = {}
+    for name, items in results.items():
+        severity = SEVERITY[name]
+        # A season still being played is expected to be incomplete
+        if name == "round_robin" and items and all(item["in_progress"] for item in items):
+            severity = "info"
+        checks[name] = {"severity": severity, "count": len(items), "items": items}
+
+    return {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "rows": len(m),
+        "teams": len(m.teams.values),
+        "timing_seconds": {"load": round(loaded - started, 3), "checks": round(finished - loaded, 3)},
+        "ok": not any(c["count"] and c["severity"] == "error" for c in checks.values()),
+        "checks": checks,
+    }
+
+
+def load_rows(backend: str = "supabase"):
+    if backend != "supabase":
+        return open_local_backend(backend).rows(columns=COLUMNS)
+
+    load_dotenv()
+    from supabase import create_client
+    url = os.getenv("VITE_SUPABASE_URL")
+    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("VITE_SUPABASE_ANON_KEY")
+    if not url or not key:
+        print("❌ Missing Supabase credentials in .env")
+        sys.exit(1)
+    return iter_table(create_client(url, key), "matches", ", ".join(COLUMNS), workers=DEFAULT_WORKERS)
+
+
+def print_summary(report: dict):
+    icons = {"error": "❌", "warning": "⚠️ ", "info": "ℹ️ "}
+    print(f"\n🔍 Validazione matches: {report['rows']} partite, {report['teams']} nomi squadra "
+          f"(load {report['timing_seconds']['load']}s, check {report['timing_seconds']['checks']}s)")
+    for name, check in report["checks"].items():
+        icon = icons[check["severity"]] if check["count"] else "✅"
+        print(f"   {icon} {name}: {check['count']}")
+    print("✅ Nessun errore strutturale" if report["ok"] else "❌ Errori strutturali trovati")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Controlli di qualità sulla tabella matches")
+    parser.add_argument("--backend", choices=BACKEND_CHOICES, default="supabase",
+                        help="Sorgente dati: Supabase o mirror locale (Parquet / SQLite)")
+    parser.add_argument("--output", help="Scrivi il report JSON in questo file")
+    parser.add_argument("--json", action="store_true", help="Stampa il report JSON su stdout")
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        print("❌ numpy is required (pip install numpy)")
+        sys.exit(2)
+
+    report = validate(load_rows(args.backend))
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_summary(report)
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
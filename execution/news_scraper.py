@@ -13,7 +13,8 @@ import json
 import time
 import hashlib
 import logging
-import re
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
@@ -25,10 +26,18 @@ if sys.platform == 'win32':
     sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 
 import requests
+import yaml
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from http_cache import HttpCache
+from rate_limiter import HostRateLimiter
+from rss_stream import CHUNK_SIZE, iter_items
+from sqlite_mirror import SqliteMirror
+from team_matcher import TeamMatcher
+from team_resolver import resolve_team
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -54,12 +63,29 @@ else:
         logger.error(f"Failed to connect to Supabase: {e}")
         supabase = None
 
-# Configuration
-RATE_LIMIT_SECONDS = 3
-TIMEOUT_SECONDS = 10
-MAX_ARTICLES_PER_SOURCE = 20
+# Configuration (`scraper` section of config/settings.yaml, these values as defaults)
+SETTINGS_PATH = Path(__file__).parent.parent / "config" / "settings.yaml"
+
+
+def load_scraper_settings(path: Path = SETTINGS_PATH) -> dict:
+    try:
+        return (yaml.safe_load(path.read_text(encoding="utf-8")) or {}).get("scraper") or {}
+    except (OSError, yaml.YAMLError) as e:
+        logger.warning(f"Could not read scraper settings from {path}: {e}")
+        return {}
+
+
+SCRAPER_SETTINGS = load_scraper_settings()
+RATE_LIMIT_SECONDS = SCRAPER_SETTINGS.get("rate_limit_seconds", 3)   # per host
+TIMEOUT_SECONDS = SCRAPER_SETTINGS.get("timeout_seconds", 10)
+MAX_ARTICLES_PER_SOURCE = SCRAPER_SETTINGS.get("max_articles_per_source", 20)
+MAX_WORKERS = SCRAPER_SETTINGS.get("max_workers", 4)                  # sources fetched concurrently
 CACHE_DIR = Path(__file__).parent.parent / "data" / "scraped_news"
-CACHE_TTL_MINUTES = 30
+CACHE_TTL_MINUTES = SCRAPER_SETTINGS.get("cache_ttl_minutes", 30)          # served without any request
+CACHE_MAX_AGE_HOURS = SCRAPER_SETTINGS.get("cache_max_age_hours", 24)      # kept for revalidation (ETag / 304)
+CACHE_MAX_MB = SCRAPER_SETTINGS.get("cache_max_mb", 50)
+HTTP_CACHE_DIR = CACHE_DIR / "http"
+UPSERT_BATCH = 500    # news rows per upsert request (payload size only; ~80 per scrape fit in one)
 
 # Team Synonyms for better filtering
 # Comprehensive list for all major leagues
@@ -103,7 +129,7 @@ TEAM_SYNONYMS = {
     "brentford": ["brentford", "bees", "frank"],
     "everton": ["everton", "toffees", "dyche"],
     "wolves": ["wolves", "wolverhampton", "pereira"],
-    "nottingham forest": ["nott'm forest", "nottingham forest", "forest", "nuno"],
+    "nott'm forest": ["nott'm forest", "nottingham forest", "forest", "nuno"],
     "leicester": ["leicester", "foxes", "cooper"],
     "ipswich": ["ipswich", "tractor boys", "mckenna"],
     "southampton": ["southampton", "saints", "martin"],
@@ -168,6 +194,37 @@ NEWS_SOURCES = [
     }
 ]
 
+# Terms ignored when one of these fragments follows them closely ("Inter-national", "interview")
+TERM_EXCLUSIONS = {
+    "inter": ["national", "view", "nal"],
+}
+
+
+def team_key(team: str) -> str:
+    """TEAM_SYNONYMS key of a team (via its canonical name), else the lower-case name itself"""
+    for key in (resolve_team(team).lower(), team.lower()):
+        if key in TEAM_SYNONYMS:
+            return key
+    return team.lower()
+
+
+@lru_cache(maxsize=None)
+def _article_matcher(extra_teams: tuple[str, ...] = ()) -> TeamMatcher:
+    synonyms = dict(TEAM_SYNONYMS)
+    synonyms.update({key: [key] for key in extra_teams})
+    return TeamMatcher(synonyms, NON_SOCCER_KEYWORDS, TERM_EXCLUSIONS)
+
+
+def matcher_for(teams: list[str] = ()) -> TeamMatcher:
+    """One precompiled matcher over every TEAM_SYNONYMS term + the blocklist (+ any team not listed there)"""
+    return _article_matcher(tuple(sorted({team_key(team) for team in teams} - TEAM_SYNONYMS.keys())))
+
+
+def is_team_specific(source: dict) -> bool:
+    """Sources whose URL depends on the team (searches); the others are the same feed for every team"""
+    return bool(source.get("search_rss_url") or source.get("search_url"))
+
+
 @dataclass
 class NewsArticle:
     """Represents a single news article"""
@@ -188,24 +245,53 @@ class NewsArticle:
 class NewsScraper:
     """Main scraper class with rate limiting and caching"""
     
-    def __init__(self):
+    def __init__(self, mirror: Optional[SqliteMirror] = None, concurrent: bool = True, use_cache: bool = True):
+        self.mirror = mirror
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": USER_AGENT,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
         })
-        self.last_request_time = 0
+        self.limiter = HostRateLimiter.from_settings(SCRAPER_SETTINGS, RATE_LIMIT_SECONDS)
+        self.concurrent = concurrent
         CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self.cache = HttpCache(
+            HTTP_CACHE_DIR,
+            ttl_seconds=CACHE_TTL_MINUTES * 60,
+            max_age_seconds=CACHE_MAX_AGE_HOURS * 3600,
+            max_bytes=CACHE_MAX_MB * 1024 * 1024,
+        ) if use_cache else None
+    
+    def _rate_limit(self, url: str):
+        """Ensure we don't exceed the rate limit of the host of `url` (other hosts are not delayed)"""
+        waited = self.limiter.acquire(url)
+        if waited:
+            logger.debug(f"Rate limiting: slept {waited:.2f}s for {url}")
+
+    def _get(self, url: str) -> bytes:
+        """Response body, through the HTTP cache when enabled (rate limit only for real requests)"""
+        if self.cache:
+            return self.cache.get(self.session, url, TIMEOUT_SECONDS, before_request=self._rate_limit)
+        self._rate_limit(url)
+        response = self.session.get(url, timeout=TIMEOUT_SECONDS)
+        response.raise_for_status()
+        return response.content
     
-    def _rate_limit(self):
-        """Ensure we don't exceed rate limits"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < RATE_LIMIT_SECONDS:
-            sleep_time = RATE_LIMIT_SECONDS - elapsed
-            logger.debug(f"Rate limiting: sleeping {sleep_time:.2f}s")
-            time.sleep(sleep_time)
-        self.last_request_time = time.time()
+    def _stream(self, url: str):
+        """
+        Response body as chunks, streamed off the socket (and teed into the
+        HTTP cache when enabled), so a reader that stops early never
+        downloads the rest
+        """
+        if self.cache:
+            yield from self.cache.stream(self.session, url, TIMEOUT_SECONDS,
+                                         before_request=self._rate_limit, chunk_size=CHUNK_SIZE)
+            return
+        self._rate_limit(url)
+        with self.session.get(url, timeout=TIMEOUT_SECONDS, stream=True) as response:
+            response.raise_for_status()
+            yield from response.iter_content(CHUNK_SIZE)
     
     def _class_news(self, text: str) -> str:
         """Simple keyword based classification"""
@@ -240,78 +326,99 @@ class NewsScraper:
             
         return max(-1.0, min(1.0, score))
 
-    def save_to_db(self, article: NewsArticle, team_filter: str = ""):
-        """Save article to Supabase if it doesn't exist and matches strict criteria"""
-        if not supabase:
-            return
+    def _news_row(self, article: NewsArticle, team_filter: str = "",
+                  scan: tuple[set[str], bool] | None = None) -> dict | None:
+        """
+        `news` row for an article, or None when it fails the strict filters.
+        `scan`: result of a matcher scan of the article already done by the
+        caller (covering `team_filter`), reused instead of scanning again.
+        """
+        full_text = f"{article.title} {article.raw_text}".lower()
+        key = team_key(team_filter) if team_filter else None
+        if scan is None:
+            scan = matcher_for([team_filter] if team_filter else []).scan(full_text)
+        mentioned, blocked = scan
 
-        try:
-            full_text = f"{article.title} {article.raw_text}".lower()
+        # 1. HARD BLOCK for non-soccer keywords
+        if blocked:
+            logger.debug(f"Blocked (Non-soccer): {article.title[:30]}")
+            return None
 
-            # 1. HARD BLOCK for non-soccer keywords
-            if any(word in full_text for word in NON_SOCCER_KEYWORDS):
-                logger.debug(f"Blocked (Non-soccer): {article.title[:30]}")
-                return
+        # 2. STRICT MENTION CHECK for the requested team (word-bounded, same scan)
+        if key and key not in mentioned:
+            logger.debug(f"Skipped (No strict mention of {team_filter}): {article.title[:30]}")
+            return None
 
-            # 2. STRICT REGEX MENTION CHECK for the requested team
-            team_name = team_filter if team_filter else "General"
-            
-            if team_filter:
-                search_terms = TEAM_SYNONYMS.get(team_filter.lower(), [team_filter.lower()])
-                
-                # Special handling for "Inter" to avoid "International"
-                forbidden_prefixes = ["internat", "interv", "interp", "interst", "interfac"]
-                
-                match_found = False
-                for term in search_terms:
-                    # Strict word boundary \b
-                    pattern = rf"\b{re.escape(term.lower())}\b"
-                    matches = list(re.finditer(pattern, full_text))
-                    
-                    for m in matches:
-                        # Check if it's not a false positive like "Inter-national"
-                        start, end = m.span()
-                        # peek 5 chars ahead
-                        following = full_text[end:end+8]
-                        if term.lower() == "inter" and any(fp in following for fp in ["national", "view", "nal"]):
-                            continue
-                        
-                        match_found = True
-                        break
-                    
-                    if match_found: break
-                
-                if not match_found:
-                    logger.debug(f"Skipped (No strict mention of {team_filter}): {article.title[:30]}")
-                    return
-
-            # 3. Check if exists by URL
-            res = supabase.table('news').select('id').eq('url', article.url).execute()
-            if res.data and len(res.data) > 0:
-                return
-
-            # 4. Analyze Category & Sentiment
-            category = self._class_news(full_text)
-            sentiment = self._determine_sentiment(full_text, category)
-            
-            row = {
-                "team_name": team_name,
-                "title": article.title,
-                "summary": article.raw_text[:200] if article.raw_text else "",
-                "url": article.url,
-                "source": article.source,
-                "published_at": article.published_at if article.published_at else datetime.now().isoformat(),
-                "category": category,
-                "sentiment": sentiment,
-                "reliability": article.reliability,
-                "metadata": {"scraped_at": article.scraped_at}
-            }
-
-            supabase.table('news').insert(row).execute()
-            logger.info(f"💾 Saved to DB: {article.title[:40]}... ({category})")
-            
-        except Exception as e:
-            logger.error(f"DB Save Error: {e}")
+        # Canonical name up front ("Internazionale" -> "Inter"), same as the matches table
+        team_name = resolve_team(team_filter) if team_filter else "General"
+
+        # 3. Analyze Category & Sentiment
+        category = self._class_news(full_text)
+        sentiment = self._determine_sentiment(full_text, category)
+        
+        return {
+            "team_name": team_name,
+            "title": article.title,
+            "summary": article.raw_text[:200] if article.raw_text else "",
+            "url": article.url,
+            "source": article.source,
+            "published_at": article.published_at if article.published_at else datetime.now().isoformat(),
+            "category": category,
+            "sentiment": sentiment,
+            "reliability": article.reliability,
+            "metadata": {"scraped_at": article.scraped_at}
+        }
+
+    def save_articles(self, items: list[tuple[NewsArticle, str]],
+                      scans: dict[str, tuple[set[str], bool]] | None = None) -> int:
+        """
+        Save (article, team_filter) pairs in bulk: the rows passing the strict
+        filters are written with one upsert per UPSERT_BATCH on the unique
+        `news.url` index (frontend/sql/12_news_url_unique.sql) with
+        ignore_duplicates, so URLs already stored are skipped by the database:
+        one DB call per scrape, no existence check. A failed batch is logged
+        and skipped, the others are kept. A URL appearing twice (same article
+        for two teams) is stored once, for the first team. `scans` ({url:
+        matcher scan}) lets the caller hand over scans it already did.
+        Returns the number of new rows.
+        """
+        if not supabase and not self.mirror:
+            return 0
+
+        rows: dict[str, dict] = {}
+        for article, team_filter in items:
+            if article.url in rows:
+                continue
+            row = self._news_row(article, team_filter, (scans or {}).get(article.url))
+            if row:
+                rows[article.url] = row
+        if not rows:
+            return 0
+
+        saved = 0
+        candidates = list(rows.values())
+        for i in range(0, len(candidates), UPSERT_BATCH):
+            batch = candidates[i:i + UPSERT_BATCH]
+            try:
+                if supabase:
+                    res = supabase.table('news').upsert(batch, on_conflict='url', ignore_duplicates=True).execute()
+                    # Only the rows actually inserted come back (with their ids)
+                    batch = res.data or []
+                if self.mirror and batch:
+                    self.mirror.upsert_news(batch)
+            except Exception as e:
+                logger.error(f"DB Save Error ({len(batch)} articles skipped; "
+                             f"frontend/sql/12_news_url_unique.sql applied?): {e}")
+                continue
+            for row in batch:
+                logger.debug(f"💾 Saved to DB: {row['title'][:40]}... ({row['category']})")
+            saved += len(batch)
+        logger.info(f"💾 Saved {saved} new articles ({len(rows)} candidates)")
+        return saved
+
+    def save_to_db(self, article: NewsArticle, team_filter: str = ""):
+        """Save one article to Supabase (and the optional SQLite mirror) if it doesn't exist and matches strict criteria"""
+        self.save_articles([(article, team_filter)])
 
     def fetch_rss(self, source: dict) -> list[NewsArticle]:
         """Fetch articles from RSS feed"""
@@ -320,32 +427,21 @@ class NewsScraper:
         if not rss_url:
             return articles
         
-        self._rate_limit()
-        
         try:
             logger.info(f"Fetching RSS from {source['name']}...")
-            response = self.session.get(rss_url, timeout=TIMEOUT_SECONDS)
-            response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'xml')
-            items = soup.find_all('item')[:MAX_ARTICLES_PER_SOURCE]
-            
-            for item in items:
-                title = item.find('title')
-                link = item.find('link')
-                pub_date = item.find('pubDate')
-                description = item.find('description')
-                
-                if title and link:
+            # Incremental parse: no DOM, stops after MAX_ARTICLES_PER_SOURCE items
+            for item in iter_items(self._stream(rss_url), MAX_ARTICLES_PER_SOURCE):
+                if "title" in item and "link" in item:
                     articles.append(NewsArticle(
-                        title=title.get_text(strip=True),
-                        url=link.get_text(strip=True),
+                        title=item["title"],
+                        url=item["link"],
                         source=source['name'],
-                        published_at=pub_date.get_text(strip=True) if pub_date else "",
+                        published_at=item.get("pubDate", ""),
                         scraped_at=datetime.now().isoformat(),
                         team_mentions=[],
                         category="other",
-                        raw_text=description.get_text(strip=True) if description else "",
+                        raw_text=item.get("description", ""),
                         reliability=source['reliability']
                     ))
             
@@ -370,14 +466,11 @@ class NewsScraper:
         if not url:
             return articles
         
-        self._rate_limit()
-        
         try:
             logger.info(f"Scraping HTML from {source['name']}...")
-            response = self.session.get(url, timeout=TIMEOUT_SECONDS)
-            response.raise_for_status()
+            content = self._get(url)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(content, 'html.parser')
             
             article_selector = source.get("article_selector", "article")
             article_elements = soup.select(article_selector)[:MAX_ARTICLES_PER_SOURCE]
@@ -427,52 +520,90 @@ class NewsScraper:
         
         return articles
     
+    def fetch_source(self, source: dict, team_filter: str = "") -> list[NewsArticle]:
+        """Articles of one configured source (RSS, Google News search feed or HTML)"""
+        if source.get("rss_url"):
+            return self.fetch_rss(source)
+        if source.get("search_rss_url"):
+            # Dynamically build Google News search feed
+            # Use a more specific query for certain teams
+            query = team_filter if team_filter else "football"
+            if query.lower() == "inter": query = "Inter Milan"
+            if query.lower() == "milan": query = "AC Milan"
+            
+            source_copy = source.copy()
+            source_copy["rss_url"] = source["search_rss_url"].format(query=query.replace(" ", "+"))
+            return self.fetch_rss(source_copy)
+        return self.fetch_html(source, team_filter)
+
+    def fetch_jobs(self, jobs: list[tuple[dict, str]]) -> list[list[NewsArticle]]:
+        """Fetch (source, team_filter) jobs, concurrently across hosts (per-host rate limits still apply); results in job order"""
+        if not self.concurrent or len(jobs) < 2:
+            return [self.fetch_source(source, team_filter) for source, team_filter in jobs]
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(jobs)))) as pool:
+            return list(pool.map(lambda job: self.fetch_source(*job), jobs))
+
+    def fetch_sources(self, sources: list[dict], team_filter: str = "") -> list[list[NewsArticle]]:
+        return self.fetch_jobs([(source, team_filter) for source in sources])
+
     def scrape_all_sources(self, team_filter: str = "") -> list[dict]:
         """Scrape all configured sources and push to DB"""
         all_articles = []
+        to_save = []
         
-        for source in NEWS_SOURCES:
-            # Fetch fresh data
-            if source.get("rss_url"):
-                articles = self.fetch_rss(source)
-            elif source.get("search_rss_url"):
-                # Dynamically build Google News search feed
-                # Use a more specific query for certain teams
-                query = team_filter if team_filter else "football"
-                if query.lower() == "inter": query = "Inter Milan"
-                if query.lower() == "milan": query = "AC Milan"
-                
-                source_copy = source.copy()
-                source_copy["rss_url"] = source["search_rss_url"].format(query=query.replace(" ", "+"))
-                articles = self.fetch_rss(source_copy)
-            else:
-                articles = self.fetch_html(source, team_filter)
-            
-            # Process and Save
+        for articles in self.fetch_sources(NEWS_SOURCES, team_filter):
             for article in articles:
-                self.save_to_db(article, team_filter)
+                to_save.append((article, team_filter))
                 all_articles.append(article.to_dict())
         
+        # Process and Save (one batch for the whole scrape)
+        self.save_articles(to_save)
         return all_articles
     
+    def scrape_teams(self, teams: list[str]) -> dict[str, list[dict]]:
+        """
+        Fetch once, fan out: every static feed (Gazzetta, Calciomercato, ESPN)
+        is downloaded and parsed once for all `teams`, and each of its articles
+        is routed to the teams it mentions by one multi-team matcher scan.
+        Only team-specific searches (Google News) run once per team. Each
+        article is scanned once; the strict filters at save time reuse it.
+        """
+        static = [s for s in NEWS_SOURCES if not is_team_specific(s)]
+        searches = [s for s in NEWS_SOURCES if is_team_specific(s)]
+        jobs = [(source, "") for source in static] + [(source, team) for team in teams for source in searches]
+        logger.info(f"Scraping {len(teams)} teams: {len(static)} shared feeds + {len(jobs) - len(static)} searches")
+        
+        matcher = matcher_for(teams)
+        keys = {team: team_key(team) for team in teams}
+        by_team = {team: [] for team in teams}
+        to_save = []
+        scans = {}
+        for (source, team_filter), articles in zip(jobs, self.fetch_jobs(jobs)):
+            for article in articles:
+                if article.url not in scans:
+                    scans[article.url] = matcher.scan(f"{article.title} {article.raw_text}")
+                if team_filter:
+                    targets = [team_filter]
+                else:
+                    mentioned, blocked = scans[article.url]
+                    targets = [] if blocked else [team for team in teams if keys[team] in mentioned]
+                for team in targets:
+                    to_save.append((article, team))
+                    by_team[team].append(article.to_dict())
+        self.save_articles(to_save, scans)
+        return by_team
+
     def scrape_for_match(self, home_team: str, away_team: str) -> dict:
-        """Scrape news relevant to a specific match"""
+        """Scrape news relevant to a specific match (shared feeds fetched once for both teams)"""
         logger.info(f"Scraping news for match: {home_team} vs {away_team}")
         
-        # We define a helper to scrape for a specific team
-        # In a real scenario we'd query specifically for these keywords
-        
-        # Scrape for Home Team
-        home_arts = self.scrape_all_sources(home_team)
-        
-        # Scrape for Away Team
-        away_arts = self.scrape_all_sources(away_team)
+        by_team = self.scrape_teams([home_team, away_team])
         
         return {
             "match": f"{home_team} vs {away_team}",
             "scraped_at": datetime.now().isoformat(),
-            "home_count": len(home_arts),
-            "away_count": len(away_arts)
+            "home_count": len(by_team[home_team]),
+            "away_count": len(by_team[away_team])
         }
 
 
@@ -484,20 +615,45 @@ def main():
     parser.add_argument("--team", type=str, help="Filter by team name")
     parser.add_argument("--match", type=str, nargs=2, metavar=("HOME", "AWAY"),
                         help="Scrape for specific match")
+    parser.add_argument("--teams", type=str, nargs="+", metavar="TEAM",
+                        help="Scrape many teams at once (shared feeds fetched once)")
+    parser.add_argument("--league", type=str, metavar="CODE",
+                        help="Scrape every team of a league in config/teams_2025_2026.yaml (e.g. SA)")
     parser.add_argument("--all", action="store_true", help="Scrape all sources")
+    parser.add_argument("--sqlite", action="store_true",
+                        help="Also write through to the SQLite mirror (data/magotto.sqlite)")
+    parser.add_argument("--serial", action="store_true",
+                        help="Fetch sources one at a time instead of concurrently")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Bypass the HTTP cache in data/scraped_news/http")
     
     args = parser.parse_args()
     
-    scraper = NewsScraper()
+    scraper = NewsScraper(mirror=SqliteMirror() if args.sqlite else None, concurrent=not args.serial,
+                          use_cache=not args.no_cache)
+    
+    if args.league and not args.teams:
+        from season_roster import load_expected
+        args.teams = load_expected()[args.league.upper()]["teams"]
     
     if args.match:
         scraper.scrape_for_match(args.match[0], args.match[1])
         print(f"\n✅ Scrape completed for {args.match[0]} vs {args.match[1]}")
+    elif args.teams:
+        by_team = scraper.scrape_teams(args.teams)
+        print(f"\n✅ Scraped {len(by_team)} teams:")
+        for team, articles in by_team.items():
+            print(f"   {team}: {len(articles)} articles")
     elif args.team:
         articles = scraper.scrape_all_sources(args.team)
         print(f"\n✅ Scraped {len(articles)} articles for {args.team}")
     else:
-        print("Please specify --team or --match")
+        print("Please specify --team, --teams, --league or --match")
+        return
+    
+    if scraper.cache:
+        stats = scraper.cache.stats()
+        print(f"📦 HTTP cache: {stats['hits']} hit, {stats['revalidated']} 304, {stats['misses']} download")
 
 if __name__ == "__main__":
     main()
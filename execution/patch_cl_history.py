@@ -1,7 +1,10 @@
 import os
+import argparse
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from pg_writer import PgWriter
+
 load_dotenv()
 
 # Supabase Configuration
@@ -14,19 +17,26 @@ HISTORICAL_MATCHES = [
     {"date": "2024-11-06", "home_team": "Inter", "away_team": "Arsenal", "home_goals": 1, "away_goals": 0, "league": "CL", "season": "2024-2025"}
 ]
 
-def patch_history():
-    if not SUPABASE_URL or not SUPABASE_KEY:
+def patch_history(postgres=False):
+    if not postgres and (not SUPABASE_URL or not SUPABASE_KEY):
         print("Missing credentials")
         return
 
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
     print("Inserting Inter vs Arsenal historical matches...")
     
     try:
-        res = supabase.table('matches').upsert(HISTORICAL_MATCHES, on_conflict='date,home_team,away_team').execute()
+        if postgres:
+            with PgWriter() as pg:
+                pg.upsert('matches', HISTORICAL_MATCHES)
+        else:
+            supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+            supabase.table('matches').upsert(HISTORICAL_MATCHES, on_conflict='date,home_team,away_team').execute()
         print("Successfully patched Inter-Arsenal history!")
     except Exception as e:
         print(f"Error: {e}")
 
 if __name__ == "__main__":
-    patch_history()
+    parser = argparse.ArgumentParser(description="Patch Inter-Arsenal Champions League history")
+    parser.add_argument("--postgres", action="store_true",
+                        help="Write with COPY + merge over a direct connection (SUPABASE_DB_URL)")
+    patch_history(postgres=parser.parse_args().postgres)
@@ -0,0 +1,195 @@
+"""
+PG WRITER - Scrittura diretta su Postgres (COPY + merge)
+Optional writer backend that bypasses PostgREST: rows are streamed with
+COPY into a temporary staging table and merged into the target with one
+
+    INSERT ... SELECT ... ON CONFLICT (date, home_team, away_team) DO UPDATE
+
+per batch, over a pooled direct connection. No JSON payloads, no gateway
+size limits: a 10-season re-import is a handful of round trips.
+
+The connection string comes from SUPABASE_DB_URL (Supabase dashboard ->
+Project Settings -> Database -> Connection string) or `--dsn`. Any Postgres
+works, so the path can be tested against a local server:
+
+    python execution/pg_writer.py --dsn postgresql://postgres@localhost/postgres --check
+
+Requires `pip install "psycopg[binary,pool]"` (optional dependency).
+"""
+
+import os
+import sys
+import logging
+from typing import Iterable
+
+from dotenv import load_dotenv
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Optional dependency: the direct writer is disabled when psycopg is missing
+try:
+    import psycopg
+    from psycopg import sql
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
+    PSYCOPG_AVAILABLE = True
+except ImportError:
+    PSYCOPG_AVAILABLE = False
+    logger.warning('psycopg not installed. Direct Postgres writer disabled (pip install "psycopg[binary,pool]").')
+
+DSN_ENV = "SUPABASE_DB_URL"
+MATCH_KEY = ("date", "home_team", "away_team")
+DEFAULT_POOL_SIZE = 4
+
+
+def _merge(conn, table: str, rows: Iterable[dict], conflict=MATCH_KEY) -> int:
+    """
+    COPY `rows` into a staging table and merge them into `table` on `conflict`.
+    Runs inside the caller's transaction; returns the number of rows merged.
+    Duplicate keys within one batch collapse to the last occurrence.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return 0
+
+    columns = list(first)
+    # Always pg_temp-qualified: a bare name would resolve through search_path
+    stage = sql.Identifier("pg_temp", f"_stage_{table}")
+    target = sql.Identifier(table)
+    column_list = sql.SQL(", ").join(map(sql.Identifier, columns))
+    key_list = sql.SQL(", ").join(map(sql.Identifier, conflict))
+    updated = [c for c in columns if c not in conflict]
+    if updated:
+        action = sql.SQL("DO UPDATE SET {}").format(sql.SQL(", ").join(
+            sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(c)) for c in updated))
+    else:
+        action = sql.SQL("DO NOTHING")
+
+    with conn.cursor() as cur:
+        # Same column types as the target, no constraints/defaults; dropped at commit
+        cur.execute(sql.SQL("DROP TABLE IF EXISTS {stage}").format(stage=stage))
+        cur.execute(sql.SQL(
+            "CREATE TEMP TABLE {stage} ON COMMIT DROP AS SELECT {columns} FROM {target} WITH NO DATA"
+        ).format(stage=stage, columns=column_list, target=target))
+
+        copied = 0
+        with cur.copy(sql.SQL("COPY {stage} ({columns}) FROM STDIN").format(
+                stage=stage, columns=column_list)) as copy:
+            for row in _chain(first, rows):
+                copy.write_row([row.get(c) for c in columns])
+                copied += 1
+
+        # ctid follows COPY order in the fresh staging table: keep the last row per key
+        cur.execute(sql.SQL(
+            "INSERT INTO {target} ({columns}) "
+            "SELECT DISTINCT ON ({keys}) {columns} FROM {stage} ORDER BY {keys}, ctid DESC "
+            "ON CONFLICT ({keys}) {action}"
+        ).format(target=target, columns=column_list, keys=key_list, stage=stage, action=action))
+    return copied
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+class PgWriter:
+    """Pooled direct-Postgres writer; one transaction (COPY + merge) per upsert() call"""
+
+    def __init__(self, dsn: str | None = None, pool_size: int = DEFAULT_POOL_SIZE):
+        if not PSYCOPG_AVAILABLE:
+            raise RuntimeError('psycopg is required for the direct Postgres writer')
+        load_dotenv()
+        dsn = dsn or os.getenv(DSN_ENV)
+        if not dsn:
+            raise RuntimeError(f"Missing {DSN_ENV} in .env (direct Postgres connection string)")
+        self.pool = ConnectionPool(dsn, min_size=1, max_size=max(pool_size, 1), open=True)
+
+    def upsert(self, table: str, rows: Iterable[dict], conflict=MATCH_KEY) -> int:
+        with self.pool.connection() as conn:
+            return _merge(conn, table, rows, conflict)
+
+    def select(self, query: str, params=()) -> list[dict]:
+        with self.pool.connection() as conn, conn.cursor(row_factory=dict_row) as cur:
+            cur.execute(query, params)
+            return cur.fetchall()
+
+    def delete_ids(self, table: str, ids: list[int]) -> int:
+        """One DELETE ... WHERE id = ANY(ids) statement"""
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(sql.SQL("DELETE FROM {} WHERE id = ANY(%s)").format(sql.Identifier(table)), (list(ids),))
+            return cur.rowcount
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def check(writer: PgWriter) -> bool:
+    """Round-trip COPY + merge on a throwaway table, rolled back at the end"""
+    rows = [
+        {"date": "2024-08-19", "home_team": "Genoa", "away_team": "Inter", "home_goals": 2, "away_goals": 2},
+        {"date": "2024-08-19", "home_team": "Genoa", "away_team": "Inter", "home_goals": 2, "away_goals": 3},
+        {"date": "2024-08-20", "home_team": "Milan", "away_team": "Torino", "home_goals": 1, "away_goals": 0},
+    ]
+    with writer.pool.connection() as conn:
+        with conn.transaction(force_rollback=True), conn.cursor() as cur:
+            cur.execute("""
+                CREATE TEMP TABLE pg_writer_check (
+                    id bigint generated by default as identity primary key,
+                    date date not null, home_team text not null, away_team text not null,
+                    home_goals integer not null, away_goals integer not null,
+                    UNIQUE (date, home_team, away_team)
+                )
+            """)
+            _merge(conn, "pg_writer_check", rows[:2])
+            _merge(conn, "pg_writer_check", rows[1:])
+            cur.execute("SELECT date::text, home_team, away_goals FROM pg_writer_check ORDER BY date")
+            result = cur.fetchall()
+
+    ok = result == [("2024-08-19", "Genoa", 3), ("2024-08-20", "Milan", 0)]
+    print("✅ COPY + merge OK" if ok else f"❌ Unexpected result: {result}")
+    return ok
+
+
+def open_pg_writer(pool_size: int = DEFAULT_POOL_SIZE) -> "PgWriter | None":
+    """The writer when psycopg and SUPABASE_DB_URL are available, else None (with the reason printed)"""
+    try:
+        return PgWriter(pool_size=pool_size)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return None
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="MAGOTTO direct Postgres writer")
+    parser.add_argument("--dsn", type=str, help=f"Connection string (default: ${DSN_ENV})")
+    parser.add_argument("--check", action="store_true", help="Verify COPY + merge on a temporary table")
+    args = parser.parse_args()
+
+    if not PSYCOPG_AVAILABLE:
+        sys.exit(1)
+
+    try:
+        writer = PgWriter(args.dsn)
+    except RuntimeError as e:
+        logger.error(e)
+        sys.exit(1)
+
+    with writer:
+        print(writer.select("SELECT version()")[0]["version"])
+        if args.check and not check(writer):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
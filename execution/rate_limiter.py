@@ -0,0 +1,72 @@
+"""
+RATE LIMITER - Token bucket per host per lo scraper
+One bucket per host name: independent sites are fetched in parallel, while
+each single host still sees at most one request every `interval` seconds
+(plus an optional burst). Thread-safe; a caller that has to wait reserves
+its slot under the lock and sleeps outside it, so concurrent callers for
+the same host queue up fairly.
+
+Configured from the `scraper` section of config/settings.yaml:
+
+    scraper:
+      rate_limit_seconds: 3      # default interval per host
+      burst: 1                   # requests allowed back-to-back
+      per_host:
+        news.google.com: 1       # host-specific interval
+"""
+
+import time
+import threading
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    def __init__(self, interval: float, burst: int = 1):
+        self.rate = 1.0 / interval if interval > 0 else float("inf")
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; returns how long the caller must wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    def __init__(self, interval: float, burst: int = 1, per_host: dict[str, float] | None = None):
+        self.interval = interval
+        self.burst = burst
+        self.per_host = per_host or {}
+        self.buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: dict, default_interval: float = 3) -> "HostRateLimiter":
+        return cls(
+            float(settings.get("rate_limit_seconds", default_interval)),
+            int(settings.get("burst", 1)),
+            {host: float(value) for host, value in (settings.get("per_host") or {}).items()},
+        )
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.per_host.get(host, self.interval), self.burst)
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to the host of `url` is allowed; returns the time waited"""
+        return self.bucket(urlsplit(url).hostname or "").acquire()
@@ -0,0 +1,76 @@
+"""
+RSS STREAM - Parsing incrementale dei feed RSS
+Feeds are parsed with lxml's pull parser, one chunk at a time: each
+<item> is turned into a plain dict as soon as its end tag arrives, then
+cleared together with the items before it, so the document tree never
+grows beyond one item. Parsing (and reading the chunks, e.g. a streamed
+HTTP response) stops as soon as `limit` items have been yielded.
+
+Fields mirror the old BeautifulSoup(content, 'xml') lookups: the direct
+children title / link / pubDate / description of each item, in the item's
+own namespace (so <media:title> is ignored), text stripped like
+get_text(strip=True). Malformed feeds are parsed in recover mode.
+"""
+
+from typing import Iterable, Iterator
+
+from lxml import etree
+
+CHUNK_SIZE = 16 * 1024
+ITEM_FIELDS = ("title", "link", "pubDate", "description")
+
+
+def iter_chunks(content: bytes, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """An in-memory body as parser-sized chunks"""
+    for start in range(0, len(content), size):
+        yield content[start:start + size]
+
+
+def _text(element) -> str:
+    return "".join(part.strip() for part in element.itertext())
+
+
+def _item_fields(item) -> dict:
+    namespace = etree.QName(item).namespace
+    fields = {}
+    for child in item:
+        if not isinstance(child.tag, str):
+            continue  # comments / processing instructions
+        name = etree.QName(child)
+        if name.namespace == namespace and name.localname in ITEM_FIELDS and name.localname not in fields:
+            fields[name.localname] = _text(child)
+    return fields
+
+
+def iter_items(chunks: Iterable[bytes], limit: int | None = None) -> Iterator[dict]:
+    """Yield {title, link, pubDate, description} (those present) per <item>, up to `limit`"""
+    if limit is not None and limit <= 0:
+        return
+    parser = etree.XMLPullParser(events=("end",), tag="{*}item", recover=True,
+                                 resolve_entities=False, no_network=True)
+    count = 0
+    chunks = iter(chunks)
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            for _, item in parser.read_events():
+                fields = _item_fields(item)
+                # Drop the item and everything parsed before it
+                item.clear()
+                parent = item.getparent()
+                if parent is not None:
+                    while item.getprevious() is not None:
+                        del parent[0]
+                yield fields
+                count += 1
+                if limit is not None and count >= limit:
+                    return
+        try:
+            parser.close()
+        except etree.XMLSyntaxError:
+            pass  # truncated feed: keep the items already yielded
+    finally:
+        # Stop the producer now (e.g. close a streamed HTTP response)
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
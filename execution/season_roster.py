@@ -0,0 +1,112 @@
+"""
+SEASON ROSTER - Squadre per campionato/stagione vs config/teams_2025_2026.yaml
+Reads the server-side `season_roster` aggregate (frontend/sql/11_season_roster.sql:
+one row per league, season and team with match count and last date, kept
+current by triggers on `matches`) in a single query for all leagues, and
+diffs it against the expected teams in the YAML config.
+
+Local backends (Parquet / SQLite) build the same aggregate from their rows.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+from local_backends import open_local_backend
+
+EXPECTED_PATH = Path(__file__).parent.parent / "config" / "teams_2025_2026.yaml"
+CURRENT_SEASON = "2025-2026"
+ROSTER_TABLE = "season_roster"
+
+_SEASON_SUFFIX = re.compile(r"_\d{4}_\d{4}$")
+
+
+@dataclass
+class RosterEntry:
+    matches: int
+    last_date: str | None
+
+
+@dataclass
+class RosterDiff:
+    league: str
+    name: str
+    expected: set[str]
+    present: dict[str, RosterEntry] = field(default_factory=dict)
+
+    @property
+    def missing(self) -> list[str]:
+        return sorted(self.expected - self.present.keys())
+
+    @property
+    def extra(self) -> list[str]:
+        return sorted(self.present.keys() - self.expected)
+
+    @property
+    def matches(self) -> int:
+        # Every match is counted once for each of its two teams
+        return sum(entry.matches for entry in self.present.values()) // 2
+
+    @property
+    def last_date(self) -> str | None:
+        return max((e.last_date for e in self.present.values() if e.last_date), default=None)
+
+
+def load_expected(path: Path = EXPECTED_PATH) -> dict[str, dict]:
+    """{league code: {"name": "Serie A", "teams": [...]}} from the YAML config (SERIE_A_2025_2026 sections)"""
+    data = yaml.safe_load(Path(path).read_text(encoding="utf-8"))
+    return {
+        section["code"]: {"name": _SEASON_SUFFIX.sub("", name).replace("_", " ").title(),
+                          "teams": list(section.get("teams") or [])}
+        for name, section in data.items()
+        if isinstance(section, dict) and "code" in section
+    }
+
+
+def fetch_roster(client, season: str = CURRENT_SEASON) -> dict[str, dict[str, RosterEntry]]:
+    """{league: {team: RosterEntry}} for one season, all leagues, one request"""
+    result = client.table(ROSTER_TABLE).select("league, team, matches, last_date") \
+        .eq("season", season).execute()
+    roster: dict[str, dict[str, RosterEntry]] = {}
+    for row in result.data or []:
+        roster.setdefault(row["league"], {})[row["team"]] = RosterEntry(row["matches"], row["last_date"])
+    return roster
+
+
+def roster_from_rows(rows) -> dict[str, dict[str, RosterEntry]]:
+    """Same aggregate computed from match rows (local backends)"""
+    roster: dict[str, dict[str, RosterEntry]] = {}
+    for row in rows:
+        if not row.get("league"):
+            continue
+        day = str(row["date"])[:10] if row.get("date") else None
+        teams = roster.setdefault(row["league"], {})
+        for team in (row.get("home_team"), row.get("away_team")):
+            if not team:
+                continue
+            entry = teams.get(team)
+            if entry is None:
+                teams[team] = RosterEntry(1, day)
+            else:
+                entry.matches += 1
+                if day and (entry.last_date is None or day > entry.last_date):
+                    entry.last_date = day
+    return roster
+
+
+def load_roster(client=None, backend: str = "supabase", season: str = CURRENT_SEASON):
+    if backend == "supabase":
+        return fetch_roster(client, season)
+    rows = open_local_backend(backend).rows(season=season, columns=["date", "home_team", "away_team", "league"])
+    return roster_from_rows(rows)
+
+
+def diff_rosters(roster: dict[str, dict[str, RosterEntry]], expected: dict[str, dict] | None = None) -> list[RosterDiff]:
+    """One RosterDiff per league in the YAML, in file order"""
+    expected = expected if expected is not None else load_expected()
+    return [
+        RosterDiff(league, config["name"], set(config["teams"]), roster.get(league, {}))
+        for league, config in expected.items()
+    ]
@@ -0,0 +1,227 @@
+"""
+SQLITE MIRROR - Copia embedded delle tabelle `matches` e `news`
+Optional write-through mirror of the Supabase tables in data/magotto.sqlite,
+with covering indexes for the lookups the check/cleanup scripts run:
+
+    matches(league, season, ...)    roster / season scans
+    matches(home_team, date, ...)   team history (home)
+    matches(away_team, date, ...)   team history (away)
+    news(team_name, published_at)   latest news per team
+
+The ingest (`fetch_football_data.py --sqlite`) and the scraper
+(`news_scraper.py --sqlite`) write through to it; the check and cleanup
+scripts read and maintain it with `--backend sqlite`, without the hosted
+database's 1000-row pages.
+
+Usage:
+    python execution/sqlite_mirror.py --sync     # full copy from Supabase
+    python execution/sqlite_mirror.py --stats
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from table_reader import DEFAULT_WORKERS, iter_pages
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DB_PATH = Path(__file__).parent.parent / "data" / "magotto.sqlite"
+
+MATCH_COLUMNS = ("id", "date", "home_team", "away_team", "home_goals", "away_goals",
+                 "home_xg", "away_xg", "league", "season")
+NEWS_COLUMNS = ("id", "team_name", "title", "summary", "url", "source", "published_at",
+                "category", "sentiment", "reliability", "metadata")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER,
+    date TEXT NOT NULL,
+    home_team TEXT NOT NULL,
+    away_team TEXT NOT NULL,
+    home_goals INTEGER NOT NULL,
+    away_goals INTEGER NOT NULL,
+    home_xg REAL DEFAULT 0,
+    away_xg REAL DEFAULT 0,
+    league TEXT,
+    season TEXT,
+    PRIMARY KEY (date, home_team, away_team)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_matches_league_season
+    ON matches(league, season, date, home_team, away_team);
+CREATE INDEX IF NOT EXISTS idx_matches_home_date
+    ON matches(home_team, date, away_team, home_goals, away_goals);
+CREATE INDEX IF NOT EXISTS idx_matches_away_date
+    ON matches(away_team, date, home_team, home_goals, away_goals);
+
+CREATE TABLE IF NOT EXISTS news (
+    id INTEGER,
+    team_name TEXT NOT NULL,
+    title TEXT NOT NULL,
+    summary TEXT,
+    url TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    published_at TEXT NOT NULL,
+    category TEXT NOT NULL,
+    sentiment REAL NOT NULL DEFAULT 0,
+    reliability REAL NOT NULL DEFAULT 1.0,
+    metadata TEXT DEFAULT '{}'
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_team_published
+    ON news(team_name, published_at DESC);
+"""
+
+
+class SqliteMirror:
+    """Thread-safe wrapper around one SQLite connection (WAL mode)"""
+
+    def __init__(self, path: Path = DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def execute(self, sql: str, params=()) -> int:
+        """Run a write statement; returns the number of affected rows"""
+        with self._lock, self.conn:
+            return self.conn.execute(sql, params).rowcount
+
+    def select(self, sql: str, params=()) -> list[dict]:
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    # ---------- Writes ----------
+
+    def upsert_matches(self, rows: list[dict]) -> int:
+        sql = f"""
+            INSERT INTO matches ({", ".join(MATCH_COLUMNS)})
+            VALUES ({", ".join("?" for _ in MATCH_COLUMNS)})
+            ON CONFLICT(date, home_team, away_team) DO UPDATE SET
+                id = COALESCE(excluded.id, matches.id),
+                home_goals = excluded.home_goals, away_goals = excluded.away_goals,
+                home_xg = excluded.home_xg, away_xg = excluded.away_xg,
+                league = excluded.league, season = excluded.season
+        """
+        params = [
+            (r.get("id"), str(r["date"])[:10], r["home_team"], r["away_team"], r["home_goals"], r["away_goals"],
+             float(r.get("home_xg") or 0), float(r.get("away_xg") or 0), r.get("league"), r.get("season"))
+            for r in rows
+        ]
+        with self._lock, self.conn:
+            self.conn.executemany(sql, params)
+        return len(params)
+
+    def upsert_news(self, rows: list[dict]) -> int:
+        sql = f"""
+            INSERT INTO news ({", ".join(NEWS_COLUMNS)})
+            VALUES ({", ".join("?" for _ in NEWS_COLUMNS)})
+            ON CONFLICT(url) DO UPDATE SET
+                team_name = excluded.team_name, title = excluded.title, summary = excluded.summary,
+                category = excluded.category, sentiment = excluded.sentiment
+        """
+        params = [
+            (r.get("id"), r["team_name"], r["title"], r.get("summary"), r["url"], r["source"], r["published_at"],
+             r["category"], r.get("sentiment", 0), r.get("reliability", 1.0), json.dumps(r.get("metadata") or {}))
+            for r in rows if r.get("url")
+        ]
+        with self._lock, self.conn:
+            self.conn.executemany(sql, params)
+        return len(params)
+
+    # ---------- Reads (same filters as MatchStore.rows) ----------
+
+    def rows(self, league=None, season=None, team=None, date_from=None, date_to=None,
+             columns=None) -> list[dict]:
+        clauses, params = [], []
+        if league:
+            clauses.append("league = ?")
+            params.append(league)
+        if season:
+            clauses.append("season = ?")
+            params.append(season)
+        if team:
+            clauses.append("(home_team = ? OR away_team = ?)")
+            params.extend([team, team])
+        if date_from:
+            clauses.append("date >= ?")
+            params.append(str(date_from)[:10])
+        if date_to:
+            clauses.append("date <= ?")
+            params.append(str(date_to)[:10])
+
+        selected = [c for c in (columns or MATCH_COLUMNS) if c in MATCH_COLUMNS]
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self.select(f"SELECT {', '.join(selected)} FROM matches{where}", params)
+
+    def news(self, team_name=None, limit=None) -> list[dict]:
+        sql = "SELECT * FROM news"
+        params = []
+        if team_name:
+            sql += " WHERE team_name = ?"
+            params.append(team_name)
+        sql += " ORDER BY published_at DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return self.select(sql, params)
+
+    def stats(self) -> dict:
+        return {
+            "matches": self.select("SELECT COUNT(*) AS n FROM matches")[0]["n"],
+            "news": self.select("SELECT COUNT(*) AS n FROM news")[0]["n"],
+        }
+
+    # ---------- Sync ----------
+
+    def sync_from_supabase(self, client) -> dict:
+        """Full copy of `matches` and `news` (keyset pages, concurrent id ranges)"""
+        counts = {}
+        for table, upsert in (("matches", self.upsert_matches), ("news", self.upsert_news)):
+            counts[table] = 0
+            for page in iter_pages(client, table, '*', workers=DEFAULT_WORKERS):
+                counts[table] += upsert(page)
+        logger.info(f"SQLite mirror synced: {counts}")
+        return counts
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="MAGOTTO SQLite mirror")
+    parser.add_argument("--sync", action="store_true", help="Copy matches and news from Supabase")
+    parser.add_argument("--stats", action="store_true", help="Print row counts")
+    args = parser.parse_args()
+
+    mirror = SqliteMirror()
+
+    if args.sync:
+        load_dotenv()
+        from supabase import create_client
+        url = os.getenv("VITE_SUPABASE_URL")
+        key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("VITE_SUPABASE_ANON_KEY")
+        if not url or not key:
+            logger.error("Supabase credentials not found. Check your .env file.")
+            sys.exit(1)
+        mirror.sync_from_supabase(create_client(url, key))
+
+    if args.stats or not args.sync:
+        print(mirror.stats())
+
+
+if __name__ == "__main__":
+    main()
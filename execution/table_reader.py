@@ -0,0 +1,137 @@
+"""
+TABLE READER - Lettura completa di una tabella Supabase, paginata per id
+Keyset pagination instead of `range(offset, ...)`: every page is
+`id > last_id ORDER BY id LIMIT 1000`, which the primary-key index serves
+at the same cost on page 1 and page 500 (offset pages get slower the
+deeper they go).
+
+With workers > 1 the id span [min id, max id] is split into that many
+contiguous ranges, each read by its own thread; pages are handed to the
+caller through a small bounded queue, so memory stays at a few pages
+whatever the table size. Rows are yielded as they arrive: ordered by id
+within a range, but ranges interleave.
+
+    for row in iter_table(supabase, "matches", "id, date, home_team", workers=4):
+        ...
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+PAGE_SIZE = 1000        # PostgREST max rows per request
+DEFAULT_WORKERS = 4
+ID_COLUMN = "id"
+
+_DONE = object()
+
+
+def _query(client, table: str, columns: str, filters: dict | None):
+    query = client.table(table).select(columns)
+    for column, value in (filters or {}).items():
+        query = query.eq(column, value)
+    return query
+
+
+def _columns_with_id(columns: str) -> str:
+    names = [c.strip() for c in columns.split(",")]
+    if "*" in names or ID_COLUMN in names:
+        return columns
+    return f"{ID_COLUMN}, {columns}"
+
+
+def id_bounds(client, table: str, filters: dict | None = None) -> tuple[int, int] | None:
+    """(min id, max id) of the rows matching `filters`, or None if there are none"""
+    first = _query(client, table, ID_COLUMN, filters).order(ID_COLUMN).limit(1).execute().data
+    if not first:
+        return None
+    last = _query(client, table, ID_COLUMN, filters).order(ID_COLUMN, desc=True).limit(1).execute().data
+    return first[0][ID_COLUMN], last[0][ID_COLUMN]
+
+
+def split_ranges(low: int, high: int, parts: int) -> list[tuple[int, int]]:
+    """[low, high] as up to `parts` contiguous inclusive ranges"""
+    parts = max(1, min(parts, high - low + 1))
+    step = (high - low + 1) / parts
+    bounds = [low + round(step * i) for i in range(parts)] + [high + 1]
+    return [(bounds[i], bounds[i + 1] - 1) for i in range(parts)]
+
+
+def iter_range_pages(client, table: str, columns: str = "*", filters: dict | None = None,
+                     low: int | None = None, high: int | None = None, page_size: int = PAGE_SIZE):
+    """Keyset pages of rows with low <= id <= high (open-ended when None)"""
+    columns = _columns_with_id(columns)
+    last_id = None
+    while True:
+        query = _query(client, table, columns, filters)
+        if last_id is not None:
+            query = query.gt(ID_COLUMN, last_id)
+        elif low is not None:
+            query = query.gte(ID_COLUMN, low)
+        if high is not None:
+            query = query.lte(ID_COLUMN, high)
+        page = query.order(ID_COLUMN).limit(page_size).execute().data or []
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        last_id = page[-1][ID_COLUMN]
+
+
+def iter_pages(client, table: str, columns: str = "*", filters: dict | None = None,
+               workers: int = 1, page_size: int = PAGE_SIZE):
+    """Pages (lists of rows) of the whole table, read by `workers` concurrent id ranges"""
+    if workers <= 1:
+        yield from iter_range_pages(client, table, columns, filters, page_size=page_size)
+        return
+
+    bounds = id_bounds(client, table, filters)
+    if bounds is None:
+        return
+    ranges = split_ranges(*bounds, workers)
+
+    pages: queue.Queue = queue.Queue(maxsize=2 * len(ranges))
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def read_range(low, high):
+        try:
+            for page in iter_range_pages(client, table, columns, filters, low, high, page_size):
+                if stop.is_set():
+                    return
+                put(page)
+        except Exception as e:
+            put(e)
+        finally:
+            put(_DONE)
+
+    with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+        for low, high in ranges:
+            pool.submit(read_range, low, high)
+        try:
+            running = len(ranges)
+            while running:
+                item = pages.get()
+                if item is _DONE:
+                    running -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            # Consumer stopped early or a range failed: let the other threads exit
+            stop.set()
+
+
+def iter_table(client, table: str, columns: str = "*", filters: dict | None = None,
+               workers: int = 1, page_size: int = PAGE_SIZE):
+    """Rows of `table` (equality `filters`), one at a time"""
+    for page in iter_pages(client, table, columns, filters, workers, page_size):
+        yield from page
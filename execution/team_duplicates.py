@@ -0,0 +1,216 @@
+"""
+TEAM DUPLICATES - Ricerca di nomi squadra quasi duplicati
+Scales to every team name across all leagues without comparing every pair:
+
+  1. blocking: each name is split into character trigrams of its lookup
+     key (case/accent-free, see team_resolver.lookup_key) and indexed in an
+     inverted index; only names sharing enough trigrams become candidates.
+     Trigrams present in too many names ("ing", " fc") are ignored.
+  2. scoring: candidates are scored with the best of normalised edit
+     similarity and token-set overlap. Containment ("Sporting" / "Sporting
+     CP": a one-word name inside a longer one, or a whole-word prefix) is
+     weaker evidence: it only counts when the shorter name is not a club
+     the resolver knows ("Inter" / "Inter Miami", "Stuttgart" /
+     "Stuttgarter Kickers" are not duplicates).
+  3. clustering: pairs above the threshold are merged with union-find,
+     strongest first; containment-only pairs never chain two clusters,
+     they only attach a single name. A cluster is scored by its weakest link,
+     ranked by score and size and gets a suggested canonical name
+     (resolver canonical first, then the most used spelling).
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+from team_resolver import get_resolver, lookup_key
+
+NGRAM = 3
+MIN_SHARED_NGRAMS = 2
+MAX_POSTING_FRACTION = 0.05   # trigrams found in more than 5% of names are not used for blocking
+MIN_POSTING_LIMIT = 20
+DEFAULT_MIN_SCORE = 0.8
+MIN_TOKEN_LENGTH = 3           # "fc", "ac", "de" do not count as shared words
+CONTAINMENT_SCORE = 0.9        # cap for name-inside-name evidence
+
+
+def ngrams(key: str, n: int = NGRAM) -> set[str]:
+    padded = f" {key} "
+    return {padded[i:i + n] for i in range(max(len(padded) - n + 1, 1))}
+
+
+def edit_similarity(a: str, b: str) -> float:
+    """1 - Levenshtein distance / longer length"""
+    if a == b:
+        return 1.0
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return 1.0 - previous[-1] / len(a)
+
+
+def token_set_similarity(a: str, b: str) -> float:
+    """Shared meaningful words over the words of the shorter name"""
+    ta = {t for t in a.split() if len(t) >= MIN_TOKEN_LENGTH}
+    tb = {t for t in b.split() if len(t) >= MIN_TOKEN_LENGTH}
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / min(len(ta), len(tb))
+
+
+def prefix_similarity(a: str, b: str) -> float:
+    """'sporting' / 'sporting cp': one key is a prefix (4+ characters, whole words) of the other"""
+    short, long_ = sorted((a, b), key=len)
+    if len(short) >= 4 and long_.startswith(short) and long_[len(short):len(short) + 1] in ("", " "):
+        return CONTAINMENT_SCORE
+    return 0.0
+
+
+def _tokens(key: str) -> set[str]:
+    return {t for t in key.split() if len(t) >= MIN_TOKEN_LENGTH}
+
+
+def strong_similarity(a: str, b: str) -> float:
+    """Edit similarity, or word overlap unless the shorter name is a single word"""
+    score = edit_similarity(a, b)
+    ta, tb = _tokens(a), _tokens(b)
+    if ta == tb or min(len(ta), len(tb)) >= 2:
+        score = max(score, token_set_similarity(a, b))
+    return score
+
+
+def containment_similarity(a: str, b: str) -> float:
+    """'sporting' inside 'sporting cp' (one-word subset or whole-word prefix)"""
+    return min(CONTAINMENT_SCORE, max(token_set_similarity(a, b), prefix_similarity(a, b)))
+
+
+def similarity(a: str, b: str) -> float:
+    return max(strong_similarity(a, b), containment_similarity(a, b))
+
+
+@dataclass
+class DuplicateCluster:
+    names: list[str]
+    score: float
+    suggested: str
+    counts: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def aliases(self) -> list[str]:
+        return [n for n in self.names if n != self.suggested]
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def candidate_pairs(keys: list[str]) -> set[tuple[int, int]]:
+    """Index pairs that share at least MIN_SHARED_NGRAMS informative trigrams"""
+    grams = [ngrams(key) for key in keys]
+    postings: dict[str, list[int]] = {}
+    for i, gram_set in enumerate(grams):
+        for gram in gram_set:
+            postings.setdefault(gram, []).append(i)
+
+    limit = max(MIN_POSTING_LIMIT, int(len(keys) * MAX_POSTING_FRACTION))
+    pairs = set()
+    for i, gram_set in enumerate(grams):
+        shared = Counter()
+        for gram in gram_set:
+            posting = postings[gram]
+            if len(posting) > limit:
+                continue
+            shared.update(j for j in posting if j > i)
+        # Short keys have few trigrams: one shared is enough for them
+        needed = 1 if len(gram_set) <= MIN_SHARED_NGRAMS + 1 else MIN_SHARED_NGRAMS
+        pairs.update((i, j) for j, count in shared.items() if count >= needed)
+    return pairs
+
+
+def find_duplicate_clusters(team_counts: dict[str, int], min_score: float = DEFAULT_MIN_SCORE) -> list[DuplicateCluster]:
+    """
+    `team_counts`: {team name: number of matches}. Returns clusters of likely
+    duplicates, best first; every name appears in at most one cluster.
+    """
+    names = sorted(team_counts)
+    keys = [lookup_key(name) for name in names]
+    resolver = get_resolver()
+
+    resolved = [resolver.resolve(name) for name in names]
+    known = [resolver.is_canonical(r) for r in resolved]
+    edges: list[tuple[float, int, int]] = []
+    contained: list[tuple[float, int, int]] = []
+    for i, j in candidate_pairs(keys):
+        if resolved[i] == resolved[j]:
+            edges.append((1.0, i, j))
+            continue
+        if known[i] and known[j]:
+            continue  # two different known clubs ("Milan" / "Inter Milan" -> Inter)
+        score = strong_similarity(keys[i], keys[j])
+        if score >= min_score:
+            edges.append((score, i, j))
+            continue
+        shorter = min((i, j), key=lambda k: len(keys[k]))
+        score = containment_similarity(keys[i], keys[j])
+        if score >= min_score and not known[shorter]:
+            contained.append((score, i, j))
+
+    # Strongest links first, so a cluster's score is the weakest link it needs
+    union = _UnionFind(len(names))
+    size = [1] * len(names)
+    link_scores: dict[int, float] = {}
+    for containment_only, pool in ((False, edges), (True, contained)):
+        for score, i, j in sorted(pool, reverse=True):
+            ri, rj = union.find(i), union.find(j)
+            if ri == rj or (containment_only and size[ri] > 1 and size[rj] > 1):
+                continue
+            weakest = min(score, link_scores.get(ri, 1.0), link_scores.get(rj, 1.0))
+            union.union(ri, rj)
+            root = union.find(ri)
+            size[root] = size[ri] + size[rj]
+            link_scores[root] = weakest
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(names)):
+        groups.setdefault(union.find(i), []).append(i)
+
+    clusters = []
+    for root, members in groups.items():
+        if len(members) < 2:
+            continue
+        member_names = [names[i] for i in members]
+        counts = {name: team_counts[name] for name in member_names}
+        clusters.append(DuplicateCluster(
+            names=sorted(member_names, key=lambda n: (-counts[n], n)),
+            score=round(link_scores[root], 3),
+            suggested=suggest_canonical(member_names, counts),
+            counts=counts,
+        ))
+
+    clusters.sort(key=lambda c: (-c.score, -len(c.names), c.suggested))
+    return clusters
+
+
+def suggest_canonical(names: list[str], counts: dict[str, int]) -> str:
+    """Resolver canonical name if any member maps to one, else the most used spelling"""
+    resolver = get_resolver()
+    known = [c for c in (resolver.resolve(name) for name in names) if resolver.is_canonical(c)]
+    if known:
+        return Counter(known).most_common(1)[0][0]
+    return max(names, key=lambda n: (counts.get(n, 0), -len(n), n))
@@ -0,0 +1,62 @@
+"""
+TEAM MATCHER - Quali squadre cita un articolo, in una sola passata
+All synonyms of a set of teams are compiled into one regular expression
+(a word-bounded alternation, longest terms first), so one scan of the
+article text returns every team it mentions instead of one regex per
+synonym per team. A term shared by several teams ("rossoblù": Bologna and
+Cagliari) reports all of them; at a given position the longest term wins
+("inter milan" is Inter, not Milan).
+
+The same scan also checks:
+  - a blocklist (non-soccer keywords), matched as plain substrings like
+    `word in text`; the first hit stops the scan;
+  - per-term exclusions: a term is ignored when one of its excluded
+    fragments starts within EXCLUSION_WINDOW characters after it
+    ("inter" followed by "national": "inter-national").
+"""
+
+import re
+
+EXCLUSION_WINDOW = 8
+
+
+class TeamMatcher:
+    def __init__(self, synonyms: dict[str, list[str]], blocklist: list[str] = (),
+                 exclusions: dict[str, list[str]] | None = None):
+        """`synonyms`: {team key: [lower-case terms]}; `exclusions`: {term: [fragments]}"""
+        self.teams_by_term: dict[str, set[str]] = {}
+        for team, terms in synonyms.items():
+            for term in terms:
+                self.teams_by_term.setdefault(term.lower(), set()).add(team)
+        exclusions = exclusions or {}
+
+        def alternative(term: str) -> str:
+            lookaheads = "".join(
+                rf"(?!(?s:.){{0,{max(0, EXCLUSION_WINDOW - len(fragment))}}}{re.escape(fragment)})"
+                for fragment in exclusions.get(term, [])
+            )
+            return re.escape(term) + lookaheads
+
+        branches = []
+        if blocklist:
+            blocked = "|".join(re.escape(w.lower()) for w in sorted(blocklist, key=len, reverse=True))
+            branches.append(f"(?P<block>{blocked})")
+        if self.teams_by_term:
+            terms = "|".join(alternative(t) for t in sorted(self.teams_by_term, key=len, reverse=True))
+            branches.append(rf"\b(?P<team>{terms})\b")
+        self.pattern = re.compile("|".join(branches)) if branches else None
+
+    def scan(self, text: str) -> tuple[set[str], bool]:
+        """(team keys mentioned in `text`, blocked) - matched case-insensitively, one pass"""
+        found = set()
+        if self.pattern is None:
+            return found, False
+        for match in self.pattern.finditer(text.lower()):
+            if match.lastgroup == "block":
+                return set(), True
+            found |= self.teams_by_term[match.group("team")]
+        return found, False
+
+    def teams_in(self, text: str) -> set[str]:
+        """Team keys mentioned in `text` (empty when blocked)"""
+        return self.scan(text)[0]
@@ -0,0 +1,25 @@
+"""
+TEAM NORMALIZATION - Rinomina bulk delle squadre lato server
+Sends the whole alias map to the `normalize_team_names` database function
+(frontend/sql/09_normalize_team_names.sql), which rewrites home_team and
+away_team with one join-based UPDATE. One round trip regardless of map size.
+"""
+
+RPC_NAME = "normalize_team_names"
+
+
+def normalize_remote(client, aliases: dict[str, str]) -> list[dict]:
+    """
+    Apply {alias: canonical} to `matches` in a single RPC call. Returns one
+    row per alias that matched: alias, canonical, home_updated, away_updated
+    and skipped (renames left alone because the canonical fixture exists).
+    """
+    result = client.rpc(RPC_NAME, {"aliases": aliases}).execute()
+    return result.data or []
+
+
+def report_totals(rows: list[dict]) -> tuple[int, int]:
+    """(updated, skipped) summed over the per-alias rows"""
+    updated = sum(r["home_updated"] + r["away_updated"] for r in rows)
+    skipped = sum(r["skipped"] for r in rows)
+    return updated, skipped
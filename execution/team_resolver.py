@@ -0,0 +1,156 @@
+"""
+TEAM RESOLVER - Nome canonico delle squadre, unica fonte
+Loads config/team_aliases.json once and builds a hash index from every
+known spelling to the canonical name used in the database (the
+football-data.co.uk CSV names: "Inter", "Man City", "Ath Madrid", ...).
+
+Lookup keys ignore case, accents, repeated whitespace and a trailing
+country code ("Arsenal FC (ENG)"). A name that is not in the index is
+retried without common club affixes (FC, CF, SSC, ...); a club that is
+not known at all is returned cleaned and without those affixes ("Everton
+FC" -> "Everton", "FC Schalke 04" -> "Schalke 04"), as the old
+clean_team_name did, so unmapped clubs do not get one name per spelling.
+
+Ingest scripts call resolve_team() inline so canonical names are written
+up front; the post-hoc sweeps (sync_teams.py, db_cleanup.py) only repair
+legacy rows, with alias_map(include_repairs=True).
+
+Self-check (every alias of the data file, affix stripping of unknown clubs):
+    python execution/team_resolver.py --check
+    python execution/team_resolver.py "Internazionale Milano (ITA)" "Everton FC"
+"""
+
+import re
+import json
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+ALIASES_PATH = Path(__file__).parent.parent / "config" / "team_aliases.json"
+
+_COUNTRY_CODE = re.compile(r"\s*\([A-Z]{3}\)\s*$")
+_CLUB_AFFIXES = re.compile(
+    r"^(?:(?:FC|AFC|CF|SK|FK|SC|SSC|AS|AC|BC|PAE|CD|UD|RCD)\s+)+"
+    r"|(?:\s+(?:FC|AFC|CF|SK|FK|SC|BC|KV|SFP|JK))+$"
+)
+
+
+def clean_name(name: str) -> str:
+    """Display form: country code removed, whitespace collapsed"""
+    return " ".join(_COUNTRY_CODE.sub("", name or "").split())
+
+
+def lookup_key(name: str) -> str:
+    """Index key: cleaned, accent-free, case-folded"""
+    decomposed = unicodedata.normalize("NFKD", clean_name(name))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+class TeamResolver:
+    def __init__(self, teams: dict[str, list[str]], repairs: dict[str, str] | None = None):
+        self.teams = teams
+        self.repairs = repairs or {}
+        self.index: dict[str, str] = {}
+        for canonical, aliases in teams.items():
+            for name in (canonical, *aliases):
+                key = lookup_key(name)
+                previous = self.index.setdefault(key, canonical)
+                if previous != canonical:
+                    raise ValueError(f"Alias '{name}' maps to both '{previous}' and '{canonical}'")
+
+    @classmethod
+    def load(cls, path: Path = ALIASES_PATH) -> "TeamResolver":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(data["teams"], data.get("repairs"))
+
+    def resolve(self, name: str) -> str:
+        cleaned = clean_name(name)
+        canonical = self.index.get(lookup_key(cleaned))
+        if canonical:
+            return canonical
+        stripped = _CLUB_AFFIXES.sub("", cleaned)
+        if stripped and stripped != cleaned:
+            return self.index.get(lookup_key(stripped), stripped)
+        return cleaned
+
+    def is_canonical(self, name: str) -> bool:
+        return name in self.teams
+
+    def alias_map(self, include_repairs: bool = False) -> dict[str, str]:
+        """{alias: canonical} for the server-side sweep (normalize_team_names)"""
+        mapping = {alias: canonical for canonical, aliases in self.teams.items() for alias in aliases}
+        if include_repairs:
+            mapping.update(self.repairs)
+        return mapping
+
+    def variations(self) -> dict[str, list[str]]:
+        """{canonical: [aliases]} as listed in the data file"""
+        return {canonical: list(aliases) for canonical, aliases in self.teams.items()}
+
+
+@lru_cache(maxsize=1)
+def get_resolver() -> TeamResolver:
+    return TeamResolver.load()
+
+
+def resolve_team(name: str) -> str:
+    return get_resolver().resolve(name)
+
+
+# Unknown clubs: the affixes go, like the old clean_team_name ("FC " removed for every club)
+AFFIX_CASES = {
+    "Everton FC": "Everton",
+    "FC Schalke 04": "Schalke 04",
+    "SK Sturm Graz (AUT)": "Sturm Graz",
+    "Club Atlético Ejemplo": "Club Atlético Ejemplo",
+    "FC": "FC",
+}
+# football-data names that keep an affix must be canonical entries of the data file
+AFFIXED_CANONICALS = ("FC Koln",)
+
+
+def check(resolver: TeamResolver) -> bool:
+    """Every alias and repair of the data file maps to its canonical; unknown clubs lose their affixes"""
+    failures = []
+    for canonical, aliases in resolver.teams.items():
+        for name in (canonical, *aliases):
+            if resolver.resolve(name) != canonical:
+                failures.append((name, resolver.resolve(name), canonical))
+    for fragment, canonical in resolver.repairs.items():
+        if resolver.alias_map(include_repairs=True).get(fragment) != canonical:
+            failures.append((fragment, None, canonical))
+    for name in AFFIXED_CANONICALS:
+        if resolver.resolve(name) != name:
+            failures.append((name, resolver.resolve(name), name))
+    for name, expected in AFFIX_CASES.items():
+        if resolver.is_canonical(resolver.resolve(name)):
+            continue  # became a known club in the data file
+        if resolver.resolve(name) != expected:
+            failures.append((name, resolver.resolve(name), expected))
+
+    for name, got, expected in failures:
+        print(f"❌ '{name}' -> '{got}' (expected '{expected}')")
+    if not failures:
+        aliases = sum(len(a) + 1 for a in resolver.teams.values())
+        print(f"✅ {aliases} names + {len(resolver.repairs)} repairs + {len(AFFIX_CASES)} unknown clubs resolve as expected")
+    return not failures
+
+
+def main():
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Nome canonico delle squadre (config/team_aliases.json)")
+    parser.add_argument("names", nargs="*", help="Nomi da risolvere")
+    parser.add_argument("--check", action="store_true", help="Verifica alias, repairs e rimozione affissi")
+    args = parser.parse_args()
+
+    resolver = get_resolver()
+    for name in args.names:
+        print(f"{name} -> {resolver.resolve(name)}")
+    if args.check and not check(resolver):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
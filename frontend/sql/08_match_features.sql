@@ -0,0 +1,62 @@
+-- =====================================================
+-- MATCH FEATURES: statistiche complete dei CSV football-data.co.uk
+-- =====================================================
+-- Esegui questo script in Supabase Dashboard → SQL Editor
+-- Popolata da: python execution/fetch_football_data.py --features
+-- =====================================================
+
+-- Tabella "larga" con una riga per partita, stessa chiave di `matches`.
+-- Tipi compatti (smallint / real) per tenere basso il peso della tabella.
+create table if not exists match_features (
+  date date not null,
+  home_team text not null,
+  away_team text not null,
+  league text,
+  season text,
+
+  ft_result char(1),            -- 'H', 'D', 'A'
+  ht_home_goals smallint,
+  ht_away_goals smallint,
+
+  home_shots smallint,
+  away_shots smallint,
+  home_shots_target smallint,
+  away_shots_target smallint,
+  home_corners smallint,
+  away_corners smallint,
+  home_fouls smallint,
+  away_fouls smallint,
+  home_yellow smallint,
+  away_yellow smallint,
+  home_red smallint,
+  away_red smallint,
+
+  -- Quote 1X2 (media mercato, poi Pinnacle, poi Bet365) e probabilità implicite senza margine
+  odds_source text,
+  odds_home real,
+  odds_draw real,
+  odds_away real,
+  prob_home real,
+  prob_draw real,
+  prob_away real,
+
+  -- Over/Under 2.5
+  odds_over25 real,
+  odds_under25 real,
+  prob_over25 real,
+
+  constraint match_features_pkey primary key (date, home_team, away_team)
+);
+
+create index if not exists idx_match_features_league_season on match_features(league, season);
+
+alter table match_features enable row level security;
+
+create policy "Allow public read match_features"
+  on match_features for select
+  to anon
+  using (true);
+
+create policy "Admins can manage match_features"
+  on match_features for all
+  using ( public.is_admin() );
@@ -0,0 +1,69 @@
+-- =====================================================
+-- NORMALIZE TEAM NAMES: rinomina bulk lato server
+-- =====================================================
+-- Esegui questo script nel SQL Editor di Supabase
+-- Usato da execution/sync_teams.py e execution/db_cleanup.py:
+--   supabase.rpc('normalize_team_names', {'aliases': {"Alias": "Canonico", ...}})
+--
+-- Un solo UPDATE con join sulla mappa alias -> nome canonico riscrive
+-- home_team e away_team di tutte le partite, qualunque sia la dimensione
+-- della mappa (una sola chiamata HTTP invece di due per alias).
+-- Le righe che dopo la rinomina collidono con una partita già presente
+-- (stessa data e stesse squadre) non vengono toccate: sono duplicati da
+-- risolvere con il job di deduplica e vengono contate in `skipped`.
+
+create or replace function public.normalize_team_names(aliases jsonb)
+returns table (
+  alias text,
+  canonical text,
+  home_updated bigint,
+  away_updated bigint,
+  skipped bigint
+)
+language sql
+as $$
+  with alias_map as (
+    select key as alias, value as canonical
+    from jsonb_each_text(aliases)
+    where key <> value
+  ),
+  targets as (
+    select m.id, m.date, m.home_team as old_home, m.away_team as old_away,
+           coalesce(h.canonical, m.home_team) as new_home,
+           coalesce(a.canonical, m.away_team) as new_away
+    from matches m
+    left join alias_map h on h.alias = m.home_team
+    left join alias_map a on a.alias = m.away_team
+    where h.alias is not null or a.alias is not null
+  ),
+  safe as (
+    -- one survivor per renamed key, and never onto an existing fixture
+    select distinct on (t.date, t.new_home, t.new_away) t.*
+    from targets t
+    where not exists (
+      select 1 from matches x
+      where x.date = t.date and x.home_team = t.new_home and x.away_team = t.new_away
+    )
+    order by t.date, t.new_home, t.new_away, t.id
+  ),
+  updated as (
+    update matches m
+    set home_team = s.new_home, away_team = s.new_away
+    from safe s
+    where m.id = s.id
+    returning m.id
+  )
+  select am.alias, am.canonical,
+         count(*) filter (where t.old_home = am.alias and u.id is not null),
+         count(*) filter (where t.old_away = am.alias and u.id is not null),
+         count(*) filter (where u.id is null)
+  from alias_map am
+  join targets t on am.alias in (t.old_home, t.old_away)
+  left join updated u on u.id = t.id
+  group by am.alias, am.canonical
+  order by am.alias;
+$$;
+
+-- Solo service role (script di manutenzione), mai anon
+revoke execute on function public.normalize_team_names(jsonb) from public, anon, authenticated;
+grant execute on function public.normalize_team_names(jsonb) to service_role;
@@ -0,0 +1,122 @@
+-- =====================================================
+-- DIMENSIONI: squadre, campionati e stagioni con id interi
+-- =====================================================
+-- Esegui questo script nel SQL Editor di Supabase (dopo 02_add_unique_constraint.sql)
+--
+-- `matches` riceve home_team_id, away_team_id, league_id e season_id.
+-- Le colonne di testo restano (frontend e upsert esistenti), ma filtri,
+-- group by e storico squadra usano gli interi e i loro indici.
+-- L'ingest (execution/fetch_football_data.py) invia già gli id; il trigger
+-- li ricava dai nomi per chi scrive solo il testo.
+
+create table if not exists teams (
+  id integer generated by default as identity primary key,
+  name text not null unique
+);
+
+create table if not exists leagues (
+  id smallint generated by default as identity primary key,
+  code text not null unique
+);
+
+create table if not exists seasons (
+  id smallint generated by default as identity primary key,
+  name text not null unique
+);
+
+alter table matches add column if not exists home_team_id integer references teams(id);
+alter table matches add column if not exists away_team_id integer references teams(id);
+alter table matches add column if not exists league_id smallint references leagues(id);
+alter table matches add column if not exists season_id smallint references seasons(id);
+
+-- Backfill
+insert into teams (name)
+  select home_team from matches union select away_team from matches
+  on conflict (name) do nothing;
+insert into leagues (code)
+  select distinct league from matches where league is not null
+  on conflict (code) do nothing;
+insert into seasons (name)
+  select distinct season from matches where season is not null
+  on conflict (name) do nothing;
+
+update matches m set
+  home_team_id = (select id from teams where name = m.home_team),
+  away_team_id = (select id from teams where name = m.away_team),
+  league_id = (select id from leagues where code = m.league),
+  season_id = (select id from seasons where name = m.season)
+where m.home_team_id is null or m.away_team_id is null
+   or (m.league is not null and m.league_id is null)
+   or (m.season is not null and m.season_id is null);
+
+create index if not exists idx_matches_home_team_id_date on matches(home_team_id, date);
+create index if not exists idx_matches_away_team_id_date on matches(away_team_id, date);
+create index if not exists idx_matches_league_season_id on matches(league_id, season_id);
+
+-- Id mancanti (o nomi cambiati, es. normalize_team_names) -> ricavati dai nomi
+create or replace function public.matches_resolve_ids()
+returns trigger as $$
+begin
+  if tg_op = 'UPDATE' then
+    if new.home_team is distinct from old.home_team and new.home_team_id is not distinct from old.home_team_id then
+      new.home_team_id := null;
+    end if;
+    if new.away_team is distinct from old.away_team and new.away_team_id is not distinct from old.away_team_id then
+      new.away_team_id := null;
+    end if;
+    if new.league is distinct from old.league and new.league_id is not distinct from old.league_id then
+      new.league_id := null;
+    end if;
+    if new.season is distinct from old.season and new.season_id is not distinct from old.season_id then
+      new.season_id := null;
+    end if;
+  end if;
+
+  if new.home_team_id is null then
+    insert into teams (name) values (new.home_team) on conflict (name) do nothing;
+    select id into new.home_team_id from teams where name = new.home_team;
+  end if;
+  if new.away_team_id is null then
+    insert into teams (name) values (new.away_team) on conflict (name) do nothing;
+    select id into new.away_team_id from teams where name = new.away_team;
+  end if;
+  if new.league_id is null and new.league is not null then
+    insert into leagues (code) values (new.league) on conflict (code) do nothing;
+    select id into new.league_id from leagues where code = new.league;
+  end if;
+  if new.season_id is null and new.season is not null then
+    insert into seasons (name) values (new.season) on conflict (name) do nothing;
+    select id into new.season_id from seasons where name = new.season;
+  end if;
+  return new;
+end;
+$$ language plpgsql security definer;
+
+drop trigger if exists matches_resolve_ids on matches;
+create trigger matches_resolve_ids
+  before insert or update on matches
+  for each row execute procedure public.matches_resolve_ids();
+
+-- Vista con i nomi presi dalle dimensioni: una rinomina tocca una sola riga di `teams`
+create or replace view matches_named as
+  select m.id, m.date, h.name as home_team, a.name as away_team,
+         m.home_goals, m.away_goals, m.home_xg, m.away_xg,
+         l.code as league, s.name as season,
+         m.home_team_id, m.away_team_id, m.league_id, m.season_id
+  from matches m
+  join teams h on h.id = m.home_team_id
+  join teams a on a.id = m.away_team_id
+  left join leagues l on l.id = m.league_id
+  left join seasons s on s.id = m.season_id;
+
+alter table teams enable row level security;
+alter table leagues enable row level security;
+alter table seasons enable row level security;
+
+create policy "Allow public read teams" on teams for select to anon using (true);
+create policy "Allow public read leagues" on leagues for select to anon using (true);
+create policy "Allow public read seasons" on seasons for select to anon using (true);
+
+create policy "Admins can manage teams" on teams for all using ( public.is_admin() );
+create policy "Admins can manage leagues" on leagues for all using ( public.is_admin() );
+create policy "Admins can manage seasons" on seasons for all using ( public.is_admin() );
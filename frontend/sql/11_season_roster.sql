@@ -0,0 +1,115 @@
+-- =====================================================
+-- ROSTER STAGIONALE: squadre per campionato e stagione
+-- =====================================================
+-- Esegui questo script nel SQL Editor di Supabase
+--
+-- `season_roster` contiene una riga per (league, season, team) con numero
+-- di partite e data dell'ultima partita. È aggiornata da trigger a livello
+-- di statement su `matches`: ogni upsert/update/delete ricalcola solo le
+-- coppie (league, season) toccate, quindi l'ingest la mantiene aggiornata
+-- senza codice lato client.
+-- check_current_season.py e sync_teams.py la confrontano con
+-- config/teams_2025_2026.yaml con una sola query (poche centinaia di righe)
+-- invece di scaricare le partite di ogni campionato.
+
+create table if not exists season_roster (
+  league text not null,
+  season text not null,
+  team text not null,
+  matches integer not null,
+  last_date date,
+  primary key (league, season, team)
+);
+
+create index if not exists idx_season_roster_season on season_roster(season);
+
+-- Ricalcolo delle coppie (league, season) indicate in `groups`
+create or replace function public.season_roster_rebuild(groups jsonb)
+returns void as $$
+begin
+  delete from season_roster r
+  using jsonb_to_recordset(groups) as g(league text, season text)
+  where r.league = g.league and r.season = g.season;
+
+  insert into season_roster (league, season, team, matches, last_date)
+  select m.league, m.season, t.team, count(*), max(m.date)::date
+  from matches m
+  join (select distinct league, season from jsonb_to_recordset(groups) as g(league text, season text)) g
+    on g.league = m.league and g.season = m.season
+  cross join lateral (values (m.home_team), (m.away_team)) as t(team)
+  group by m.league, m.season, t.team;
+end;
+$$ language plpgsql security definer;
+
+-- Ricostruzione completa (backfill, o dopo modifiche fatte con i trigger disattivati)
+create or replace function public.refresh_season_roster()
+returns integer as $$
+declare
+  total integer;
+begin
+  truncate season_roster;
+  insert into season_roster (league, season, team, matches, last_date)
+  select m.league, m.season, t.team, count(*), max(m.date)::date
+  from matches m
+  cross join lateral (values (m.home_team), (m.away_team)) as t(team)
+  where m.league is not null and m.season is not null
+  group by m.league, m.season, t.team;
+  get diagnostics total = row_count;
+  return total;
+end;
+$$ language plpgsql security definer;
+
+-- Trigger: le transition table contengono solo le righe dello statement
+create or replace function public.season_roster_after_insert()
+returns trigger as $$
+begin
+  perform public.season_roster_rebuild(
+    (select coalesce(jsonb_agg(distinct jsonb_build_object('league', league, 'season', season)), '[]')
+     from new_rows where league is not null and season is not null));
+  return null;
+end;
+$$ language plpgsql security definer;
+
+create or replace function public.season_roster_after_update()
+returns trigger as $$
+begin
+  perform public.season_roster_rebuild(
+    (select coalesce(jsonb_agg(distinct jsonb_build_object('league', league, 'season', season)), '[]')
+     from (select league, season from new_rows union select league, season from old_rows) changed
+     where league is not null and season is not null));
+  return null;
+end;
+$$ language plpgsql security definer;
+
+create or replace function public.season_roster_after_delete()
+returns trigger as $$
+begin
+  perform public.season_roster_rebuild(
+    (select coalesce(jsonb_agg(distinct jsonb_build_object('league', league, 'season', season)), '[]')
+     from old_rows where league is not null and season is not null));
+  return null;
+end;
+$$ language plpgsql security definer;
+
+drop trigger if exists season_roster_insert on matches;
+create trigger season_roster_insert
+  after insert on matches referencing new table as new_rows
+  for each statement execute procedure public.season_roster_after_insert();
+
+drop trigger if exists season_roster_update on matches;
+create trigger season_roster_update
+  after update on matches referencing old table as old_rows new table as new_rows
+  for each statement execute procedure public.season_roster_after_update();
+
+drop trigger if exists season_roster_delete on matches;
+create trigger season_roster_delete
+  after delete on matches referencing old table as old_rows
+  for each statement execute procedure public.season_roster_after_delete();
+
+-- Backfill
+select public.refresh_season_roster();
+
+alter table season_roster enable row level security;
+
+create policy "Allow public read season_roster" on season_roster for select to anon using (true);
+create policy "Admins can manage season_roster" on season_roster for all using ( public.is_admin() );
@@ -0,0 +1,17 @@
+-- =====================================================
+-- NEWS: un solo articolo per URL
+-- =====================================================
+-- Esegui questo script nel SQL Editor di Supabase (dopo 07_news_schema.sql)
+--
+-- news_scraper.py scrive gli articoli con un upsert in blocco
+-- (on_conflict=url, ignore_duplicates): gli URL già presenti vengono
+-- ignorati dal database, senza query di controllo preliminari. Serve un
+-- indice unico su `url`; i duplicati esistenti vengono eliminati prima
+-- (resta la riga con l'id più basso, cioè la prima salvata).
+
+delete from news n
+using news older
+where n.url = older.url
+  and older.id < n.id;
+
+create unique index if not exists news_url_key on news(url);